@@ -15,3 +15,5 @@ settings.MAKO_TEMPLATES['main'].extend([
 ])
 
 log.debug('MAKO_TEMPLATES["main"]: {}'.format(settings.MAKO_TEMPLATES['main']))
+
+default_app_config = 'rg_instructor_analytics.apps.InstructorAnalyticsConfig'
@@ -0,0 +1,20 @@
+"""
+App config of the rg_instructor_analytics.
+"""
+from django.apps import AppConfig
+
+
+class InstructorAnalyticsConfig(AppConfig):
+    """
+    Application configuration.
+    """
+
+    name = 'rg_instructor_analytics'
+    verbose_name = 'RG Instructor Analytics'
+
+    def ready(self):
+        """
+        Connect signal handlers.
+        """
+        from rg_instructor_analytics import signals
+        signals.connect_handlers()
@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rg_instructor_analytics', '0004_auto_20180504_0746'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CollectorCheckpoint',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('name', models.CharField(unique=True, max_length=255)),
+                ('last_update', models.DateTimeField()),
+                ('last_id', models.IntegerField(null=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils.module_loading import import_string
+import openedx.core.djangoapps.xmodule_django.models
+
+DATABASE_WATERMARK_STORAGE = 'rg_instructor_analytics.utils.watermark.DatabaseWatermarkStorage'
+
+
+def copy_last_grade_stat_update(apps, schema_editor):
+    """
+    Use the global update time as the watermark of every already collected course.
+
+    Watermarks are written to the storage, configured by `RG_ANALYTICS_WATERMARK_STORAGE`,
+    otherwise the configured storage would start with the full recalculation of every course.
+    """
+    LastGradeStatUpdate = apps.get_model('rg_instructor_analytics', 'LastGradeStatUpdate')
+    GradeStatistic = apps.get_model('rg_instructor_analytics', 'GradeStatistic')
+    GradeStatWatermark = apps.get_model('rg_instructor_analytics', 'GradeStatWatermark')
+
+    last_update = LastGradeStatUpdate.objects.order_by('-last_update').first()
+    if last_update is None:
+        return
+    course_ids = GradeStatistic.objects.values_list('course_id', flat=True).order_by('course_id').distinct()
+
+    storage_path = getattr(settings, 'RG_ANALYTICS_WATERMARK_STORAGE', DATABASE_WATERMARK_STORAGE)
+    if storage_path == DATABASE_WATERMARK_STORAGE:
+        GradeStatWatermark.objects.bulk_create([
+            GradeStatWatermark(course_id=course_id, last_update=last_update.last_update) for course_id in course_ids
+        ])
+        return
+    storage = import_string(storage_path)()
+    for course_id in course_ids:
+        storage.set(course_id, last_update.last_update)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rg_instructor_analytics', '0005_collectorcheckpoint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GradeStatWatermark',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('course_id', openedx.core.djangoapps.xmodule_django.models.CourseKeyField(unique=True, max_length=255)),
+                ('last_update', models.DateTimeField()),
+            ],
+        ),
+        migrations.RunPython(copy_last_grade_stat_update, migrations.RunPython.noop),
+        migrations.DeleteModel(
+            name='LastGradeStatUpdate',
+        ),
+    ]
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import openedx.core.djangoapps.xmodule_django.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rg_instructor_analytics', '0007_pendinggradeupdate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProblemStatistic',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('course_id', openedx.core.djangoapps.xmodule_django.models.CourseKeyField(max_length=255, db_index=True)),
+                ('module_state_key', openedx.core.djangoapps.xmodule_django.models.UsageKeyField(max_length=255)),
+                ('sum_grade', models.FloatField(default=0)),
+                ('sum_max_grade', models.FloatField(default=0)),
+                ('attempts_sum', models.IntegerField(default=0)),
+                ('attempts_count', models.IntegerField(default=0)),
+                ('submissions_count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='problemstatistic',
+            unique_together=set([('course_id', 'module_state_key')]),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import openedx.core.djangoapps.xmodule_django.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rg_instructor_analytics', '0008_problemstatistic'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LastVisitedSubsection',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('course_id', openedx.core.djangoapps.xmodule_django.models.CourseKeyField(max_length=255, db_index=True)),
+                ('student', models.IntegerField()),
+                ('module_state_key', openedx.core.djangoapps.xmodule_django.models.UsageKeyField(max_length=255)),
+                ('position', models.IntegerField(default=1)),
+                ('last_visit', models.DateTimeField()),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='lastvisitedsubsection',
+            unique_together=set([('course_id', 'student')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='lastvisitedsubsection',
+            index_together=set([('course_id', 'module_state_key', 'position')]),
+        ),
+    ]
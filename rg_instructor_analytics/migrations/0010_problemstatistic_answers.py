@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rg_instructor_analytics', '0009_lastvisitedsubsection'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='problemstatistic',
+            name='answers',
+            field=models.TextField(null=True),
+        ),
+    ]
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+from django.db.models import Case, Value, When
+import openedx.core.djangoapps.xmodule_django.models
+
+BATCH_SIZE = 1000
+SEARCH_USER_FIELDS = ('username', 'first_name', 'last_name', 'email')
+
+
+def build_search_index(apps, schema_editor):
+    """
+    Fill search text and trigrams of the already collected grade statistic.
+
+    Search texts of each batch are written with the single `UPDATE ... CASE id WHEN ...` statement.
+    """
+    GradeStatistic = apps.get_model('rg_instructor_analytics', 'GradeStatistic')
+    GradeStatisticTrigram = apps.get_model('rg_instructor_analytics', 'GradeStatisticTrigram')
+
+    last_id = 0
+    while True:
+        rows = list(
+            GradeStatistic.objects
+            .filter(id__gt=last_id)
+            .order_by('id')
+            .values('id', 'course_id', 'student_id', *['student__' + field for field in SEARCH_USER_FIELDS])
+            [:BATCH_SIZE]
+        )
+        if not rows:
+            break
+        last_id = rows[-1]['id']
+
+        search_texts, trigrams = {}, []
+        for row in rows:
+            search_text = ' '.join(row['student__' + field] or '' for field in SEARCH_USER_FIELDS).lower()
+            search_texts[row['id']] = search_text
+            trigrams.extend(
+                GradeStatisticTrigram(course_id=row['course_id'], student=row['student_id'], trigram=trigram)
+                for trigram in {search_text[index:index + 3] for index in range(len(search_text) - 2)}
+            )
+        GradeStatistic.objects.filter(id__in=search_texts.keys()).update(search_text=Case(
+            *[When(id=row_id, then=Value(search_text)) for row_id, search_text in search_texts.iteritems()],
+            output_field=models.TextField()
+        ))
+        GradeStatisticTrigram.objects.bulk_create(trigrams, batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rg_instructor_analytics', '0010_problemstatistic_answers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gradestatistic',
+            name='search_text',
+            field=models.TextField(default=''),
+        ),
+        migrations.CreateModel(
+            name='GradeStatisticTrigram',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('course_id', openedx.core.djangoapps.xmodule_django.models.CourseKeyField(max_length=255)),
+                ('student', models.IntegerField()),
+                ('trigram', models.CharField(max_length=3)),
+            ],
+        ),
+        migrations.AlterIndexTogether(
+            name='gradestatistictrigram',
+            index_together=set([('course_id', 'trigram'), ('course_id', 'student')]),
+        ),
+        migrations.RunPython(build_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from collections import OrderedDict
+import json
+
+from django.db import migrations, models
+import openedx.core.djangoapps.xmodule_django.models
+
+BATCH_SIZE = 1000
+
+
+def split_exam_info(apps, schema_editor):
+    """
+    Create per-assignment grades from the already collected grade statistic.
+    """
+    GradeStatistic = apps.get_model('rg_instructor_analytics', 'GradeStatistic')
+    GradeStatisticItem = apps.get_model('rg_instructor_analytics', 'GradeStatisticItem')
+    decoder = json.JSONDecoder(object_pairs_hook=OrderedDict)
+
+    last_id = 0
+    while True:
+        rows = list(
+            GradeStatistic.objects
+            .filter(id__gt=last_id)
+            .order_by('id')
+            .values_list('id', 'course_id', 'student_id', 'exam_info')
+            [:BATCH_SIZE]
+        )
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        GradeStatisticItem.objects.bulk_create(
+            [
+                GradeStatisticItem(
+                    course_id=course_id, student=student, label=label, percent=percent, position=position
+                )
+                for _, course_id, student, exam_info in rows
+                for position, (label, percent) in enumerate(decoder.decode(exam_info).items())
+            ],
+            batch_size=BATCH_SIZE,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rg_instructor_analytics', '0011_gradestatistic_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GradeStatisticItem',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('course_id', openedx.core.djangoapps.xmodule_django.models.CourseKeyField(max_length=255)),
+                ('student', models.IntegerField()),
+                ('label', models.CharField(max_length=255)),
+                ('percent', models.IntegerField()),
+                ('position', models.IntegerField()),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='gradestatisticitem',
+            unique_together=set([('course_id', 'student', 'label')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='gradestatisticitem',
+            index_together=set([('course_id', 'label', 'percent')]),
+        ),
+        migrations.RunPython(split_exam_info, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import openedx.core.djangoapps.xmodule_django.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rg_instructor_analytics', '0012_gradestatisticitem'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CohortEmail',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('course_id', openedx.core.djangoapps.xmodule_django.models.CourseKeyField(max_length=255)),
+                ('subject', models.TextField()),
+                ('from_address', models.CharField(max_length=255)),
+                ('text_content', models.TextField()),
+                ('html_content', models.TextField()),
+                ('created', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='CohortEmailBatch',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('recipients', models.TextField()),
+                ('sent_count', models.IntegerField(default=0)),
+                ('attempts', models.IntegerField(default=0)),
+                ('finished', models.DateTimeField(null=True)),
+                ('email', models.ForeignKey(related_name='batches', to='rg_instructor_analytics.CohortEmail')),
+            ],
+        ),
+    ]
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from array import array
+from itertools import groupby
+
+from django.db import migrations, models
+import openedx.core.djangoapps.xmodule_django.models
+
+
+def build_enrollment_series(apps, schema_editor):
+    """
+    Create dense enrollment series from the already collected enrollment statistic.
+    """
+    EnrollmentTabCache = apps.get_model('rg_instructor_analytics', 'EnrollmentTabCache')
+    EnrollmentSeries = apps.get_model('rg_instructor_analytics', 'EnrollmentSeries')
+
+    stats = (
+        EnrollmentTabCache.objects
+        .order_by('course_id', 'created')
+        .values_list('course_id', 'created', 'enroll', 'unenroll')
+        .iterator()
+    )
+    for course_id, course_stats in groupby(stats, key=lambda stat: stat[0]):
+        start, enroll, unenroll = None, array('i'), array('i')
+        for _, created, enroll_count, unenroll_count in course_stats:
+            if start is None:
+                start = created
+            missing = (created - start).days - len(enroll)
+            enroll.extend([enroll[-1] if enroll else 0] * missing)
+            unenroll.extend([unenroll[-1] if unenroll else 0] * missing)
+            enroll.append((enroll[-1] if enroll else 0) + enroll_count)
+            unenroll.append((unenroll[-1] if unenroll else 0) + unenroll_count)
+        EnrollmentSeries.objects.create(
+            course_id=course_id, start=start, enroll=enroll.tostring(), unenroll=unenroll.tostring()
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rg_instructor_analytics', '0013_cohortemail'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EnrollmentSeries',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('course_id', openedx.core.djangoapps.xmodule_django.models.CourseKeyField(
+                    unique=True, max_length=255
+                )),
+                ('start', models.DateField()),
+                ('enroll', models.BinaryField()),
+                ('unenroll', models.BinaryField()),
+            ],
+        ),
+        migrations.RunPython(build_enrollment_series, migrations.RunPython.noop),
+    ]
@@ -4,10 +4,11 @@ Models of the rg analytics.
 
 from django.contrib.auth.models import User
 from django.db.models import (
-    BooleanField, DateField, DateTimeField, FloatField, ForeignKey, IntegerField, Model, TextField
+    BinaryField, BooleanField, CharField, DateField, DateTimeField, FloatField, ForeignKey, IntegerField, Model,
+    TextField
 )
 
-from openedx.core.djangoapps.xmodule_django.models import CourseKeyField
+from openedx.core.djangoapps.xmodule_django.models import CourseKeyField, UsageKeyField
 
 
 class EnrollmentTabCache(Model):
@@ -29,6 +30,20 @@ class EnrollmentTabCache(Model):
         unique_together = ('course_id', 'created',)
 
 
+class EnrollmentSeries(Model):
+    """
+    Dense day-indexed enrollment statistic of the course.
+
+    `enroll` and `unenroll` are packed series of the cumulative counts of the enrollments and unenrollments
+    at the end of each day, starting from the `start` day (see `rg_instructor_analytics.utils.series`).
+    """
+
+    course_id = CourseKeyField(max_length=255, unique=True)
+    start = DateField()
+    enroll = BinaryField()
+    unenroll = BinaryField()
+
+
 class EnrollmentByStudent(Model):
     """
     Model for store last enrollment state of a user.
@@ -57,6 +72,8 @@ class GradeStatistic(Model):
     exam_info = TextField()
     # Represent total grade in range from 0 to 1; [0; 1]
     total = FloatField()
+    # Lowercase username, names and email of the student for the gradebook search.
+    search_text = TextField(default='')
 
     class Meta:
         """
@@ -66,10 +83,158 @@ class GradeStatistic(Model):
         unique_together = ('course_id', 'student',)
 
 
-# TODO replace this table with the Redis.
-class LastGradeStatUpdate(Model):
+class GradeStatisticItem(Model):
     """
-    For the calculation diffs for the update.
+    Grade of the student for one assignment of the course, normalized from `GradeStatistic.exam_info`.
+
+    Course grade is stored with the `total` label.
     """
 
-    last_update = DateTimeField(db_index=True)
+    course_id = CourseKeyField(max_length=255)
+    student = IntegerField()
+    label = CharField(max_length=255)
+    # Grade in percents, integer in range [0; 100].
+    percent = IntegerField()
+    # Position of the assignment in the gradebook.
+    position = IntegerField()
+
+    class Meta:
+        """
+        Meta class.
+        """
+
+        unique_together = ('course_id', 'student', 'label',)
+        index_together = ('course_id', 'label', 'percent',)
+
+
+class GradeStatisticTrigram(Model):
+    """
+    Trigram of the search text of the student, indexed for the gradebook search.
+
+    See `rg_instructor_analytics.utils.search`.
+    """
+
+    course_id = CourseKeyField(max_length=255)
+    student = IntegerField()
+    trigram = CharField(max_length=3)
+
+    class Meta:
+        """
+        Meta class.
+        """
+
+        index_together = (('course_id', 'trigram'), ('course_id', 'student'))
+
+
+class ProblemStatistic(Model):
+    """
+    Model for store aggregated answers statistic of the problem.
+    """
+
+    course_id = CourseKeyField(max_length=255, db_index=True)
+    module_state_key = UsageKeyField(max_length=255)
+    sum_grade = FloatField(default=0)
+    sum_max_grade = FloatField(default=0)
+    attempts_sum = IntegerField(default=0)
+    attempts_count = IntegerField(default=0)
+    submissions_count = IntegerField(default=0)
+    # JSON map of the question id to the histogram of its answers, null if answers are not collected yet.
+    answers = TextField(null=True)
+
+    class Meta:
+        """
+        Meta class.
+        """
+
+        unique_together = ('course_id', 'module_state_key',)
+
+
+class LastVisitedSubsection(Model):
+    """
+    Model for store the last visited subsection of the student for each course.
+    """
+
+    course_id = CourseKeyField(max_length=255, db_index=True)
+    student = IntegerField()
+    module_state_key = UsageKeyField(max_length=255)
+    # Position of the unit inside subsection, starts from 1.
+    position = IntegerField(default=1)
+    last_visit = DateTimeField()
+
+    class Meta:
+        """
+        Meta class.
+        """
+
+        unique_together = ('course_id', 'student',)
+        index_together = ('course_id', 'module_state_key', 'position',)
+
+
+class PendingGradeUpdate(Model):
+    """
+    Queue of the students, whose grade statistic should be updated by the score change events.
+
+    `created` is the time of the last score change of the student, queued items are processed from the oldest one.
+    """
+
+    course_id = CourseKeyField(max_length=255)
+    student = IntegerField()
+    created = DateTimeField(auto_now_add=True)
+
+    class Meta:
+        """
+        Meta class.
+        """
+
+        unique_together = ('course_id', 'student',)
+
+
+class GradeStatWatermark(Model):
+    """
+    Time of the last grade statistic update of the course.
+
+    Used by the default watermark storage, see `rg_instructor_analytics.utils.watermark`.
+    """
+
+    course_id = CourseKeyField(max_length=255, unique=True)
+    last_update = DateTimeField()
+
+
+class CollectorCheckpoint(Model):
+    """
+    Position of the last record, processed by the statistic collector.
+    """
+
+    name = CharField(max_length=255, unique=True)
+    last_update = DateTimeField()
+    last_id = IntegerField(null=True)
+
+
+class CohortEmail(Model):
+    """
+    Email message to the students of the cohorts, rendered once for all recipients.
+    """
+
+    course_id = CourseKeyField(max_length=255)
+    subject = TextField()
+    from_address = CharField(max_length=255)
+    text_content = TextField()
+    html_content = TextField()
+    created = DateTimeField(auto_now_add=True)
+
+
+class CohortEmailBatch(Model):
+    """
+    Part of the recipients of the cohort email, delivered by the single task over the single SMTP connection.
+
+    `sent_count` recipients of the batch have already received the message, so a retried batch continues
+    from the first recipient, that has not received it. `failed` is set, when the retries of the batch are exceeded.
+    """
+
+    email = ForeignKey(CohortEmail, related_name='batches')
+    # JSON list of the email addresses.
+    recipients = TextField()
+    sent_count = IntegerField(default=0)
+    attempts = IntegerField(default=0)
+    finished = DateTimeField(null=True)
+    failed = DateTimeField(null=True)
@@ -5,9 +5,9 @@ from django.conf import settings
 from django.core.files.storage import get_storage_class
 from django.utils.translation import ugettext_noop
 
-from courseware.access import has_access
 from courseware.tabs import CourseTab
 from openedx.core.djangoapps.site_configuration import helpers as configuration_helpers
+from rg_instructor_analytics.utils.resolver import user_has_access
 
 
 class InstructorAnalyticsDashboardTab(CourseTab):
@@ -30,7 +30,7 @@ class InstructorAnalyticsDashboardTab(CourseTab):
         """
         return bool(
             user and
-            has_access(user, 'staff', course, course.id) and
+            user_has_access(user, 'staff', course) and
             configuration_helpers.get_value(
                 'ENABLE_RG_INSTRUCTOR_ANALYTICS',
                 settings.FEATURES.get('ENABLE_RG_INSTRUCTOR_ANALYTICS', False)
@@ -0,0 +1,156 @@
+"""
+Module for the signal handlers.
+"""
+import logging
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.utils import timezone
+from opaque_keys.edx.keys import CourseKey
+
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+from rg_instructor_analytics.models import GradeStatistic, PendingGradeUpdate
+from rg_instructor_analytics.utils.courses import invalidate_course_lists, invalidate_user_courses
+from rg_instructor_analytics.utils.resolver import invalidate_user_access
+from rg_instructor_analytics.utils.response_cache import invalidate_course_responses
+from rg_instructor_analytics.utils.search import get_search_text, SEARCH_USER_FIELDS, update_search_index
+from student.models import CourseAccessRole
+
+try:
+    from lms.djangoapps.grades.signals.signals import PROBLEM_WEIGHTED_SCORE_CHANGED as SCORE_CHANGED
+except ImportError:
+    from lms.djangoapps.grades.signals.signals import PROBLEM_SCORE_CHANGED as SCORE_CHANGED
+
+log = logging.getLogger(__name__)
+
+GRADE_STAT_EVENTS = getattr(settings, 'RG_ANALYTICS_GRADE_STAT_EVENTS', False)
+# Fields of the user, that affect the access to the analytics.
+ACCESS_USER_FIELDS = ('is_staff', 'is_superuser', 'is_active')
+# Fields of the user, which changes are handled by the analytics.
+USER_TRACKED_FIELDS = SEARCH_USER_FIELDS + ACCESS_USER_FIELDS
+USER_STATE_ATTR = '_rg_analytics_state'
+
+
+def enqueue_grade_update(course_key, user_id):
+    """
+    Add the student of the course in to the queue for the grade statistic update.
+
+    Queue is deduplicated by the unique constraint, so repeated score changes produce one update.
+    Repeated change refreshes the queue time, so the item, that is being graded, is kept for the next flush.
+    """
+    queued = PendingGradeUpdate.objects.filter(course_id=course_key, student=user_id)
+    if queued.update(created=timezone.now()):
+        return
+    try:
+        with transaction.atomic():
+            PendingGradeUpdate.objects.create(course_id=course_key, student=user_id)
+    except IntegrityError:
+        # The same pair was queued by the concurrent request.
+        pass
+
+
+def score_changed_handler(sender, **kwargs):
+    """
+    Queue grade statistic update of the student, whose problem score has been changed.
+    """
+    user_id, course_id = kwargs.get('user_id'), kwargs.get('course_id')
+    if not (user_id and course_id):
+        return
+    course_key = course_id if isinstance(course_id, CourseKey) else CourseKey.from_string(course_id)
+    enqueue_grade_update(course_key, user_id)
+
+
+def get_user_state(user):
+    """
+    Return loaded values of the tracked fields of the user.
+
+    Values are read from the instance dict, so the deferred fields are not loaded.
+    """
+    return {field: user.__dict__.get(field) for field in USER_TRACKED_FIELDS}
+
+
+def get_changed_user_fields(user):
+    """
+    Return tracked fields of the user, that have been changed since the user was loaded or saved last time.
+    """
+    previous = getattr(user, USER_STATE_ATTR, {})
+    current = get_user_state(user)
+    setattr(user, USER_STATE_ATTR, current)
+    return {field for field, value in current.iteritems() if previous.get(field) != value}
+
+
+def user_loaded_handler(sender, instance, **kwargs):
+    """
+    Remember values of the tracked fields of the loaded user.
+    """
+    setattr(instance, USER_STATE_ATTR, get_user_state(instance))
+
+
+def update_user_search_text(instance):
+    """
+    Update search text of the student in the grade statistic.
+    """
+    search_text = get_search_text(instance)
+    outdated = GradeStatistic.objects.filter(student_id=instance.id).exclude(search_text=search_text)
+    course_keys = list(outdated.values_list('course_id', flat=True))
+    if not course_keys:
+        return
+    outdated.update(search_text=search_text)
+    for course_key in course_keys:
+        update_search_index(course_key, [instance.id])
+        invalidate_course_responses(course_key)
+
+
+def user_changed_handler(sender, instance, created=False, **kwargs):
+    """
+    Drop cached access decisions of the user, when the staff, superuser or active flag is changed,
+    drop cached course list of the user, when the staff flag is changed,
+    and update search text of the student, when the name or email is changed.
+
+    Fields are compared with the values of the loaded user, so saves of the other fields (i.e. `last_login`
+    on each login, profile edits) and saves of the new users are skipped without queries.
+    """
+    changed = get_changed_user_fields(instance)
+    if created:
+        return
+    if changed & set(ACCESS_USER_FIELDS):
+        invalidate_user_access(instance.id)
+    if 'is_staff' in changed:
+        invalidate_user_courses(instance.id)
+    if changed & set(SEARCH_USER_FIELDS):
+        update_user_search_text(instance)
+
+
+def access_role_changed_handler(sender, instance, **kwargs):
+    """
+    Drop cached course list and access decisions of the user, whose course or org-wide access role has been changed.
+    """
+    invalidate_user_courses(instance.user_id)
+    invalidate_user_access(instance.user_id)
+
+
+def course_overview_changed_handler(sender, **kwargs):
+    """
+    Drop cached course lists, when a course has been created, renamed or deleted.
+    """
+    invalidate_course_lists()
+
+
+def connect_handlers():
+    """
+    Connect handlers of the enabled features.
+    """
+    post_init.connect(user_loaded_handler, sender=User, dispatch_uid='rg_analytics_user_loaded')
+    post_save.connect(user_changed_handler, sender=User, dispatch_uid='rg_analytics_user_changed')
+    for signal in (post_save, post_delete):
+        signal.connect(
+            access_role_changed_handler, sender=CourseAccessRole, dispatch_uid='rg_analytics_access_role_changed'
+        )
+        signal.connect(
+            course_overview_changed_handler, sender=CourseOverview, dispatch_uid='rg_analytics_course_changed'
+        )
+    if GRADE_STAT_EVENTS:
+        SCORE_CHANGED.connect(score_changed_handler, dispatch_uid='rg_analytics_score_changed')
+        log.debug('Event-driven grade statistic update is enabled')
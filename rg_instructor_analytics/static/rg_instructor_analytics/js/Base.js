@@ -37,8 +37,38 @@ $(function() {
     const tabHolder = new TabHolder(tabs, courseSelect.val());
     tabHolder.toggleToTab('enrollment');
 
+    /**
+     * Load the next page of the available courses in to the course dropdown.
+     */
+    function loadMoreCourses() {
+        const moreOption = courseSelect.find('option[value=""]');
+        courseSelect.val(tabHolder.course);
+        $.ajax({
+            type: 'POST',
+            url: 'api/courses/',
+            data: {offset: moreOption.data('offset')},
+            dataType: 'json',
+            success: function (response) {
+                response.courses.forEach(course => {
+                    if (courseSelect.find('option[value="' + course.course_id + '"]').length === 0) {
+                        moreOption.before($('<option>').val(course.course_id).text(course.course_name));
+                    }
+                });
+                if (response.next_offset === null) {
+                    moreOption.remove();
+                } else {
+                    moreOption.data('offset', response.next_offset);
+                }
+            },
+        });
+    }
+
     courseSelect.change(e => {
-        tabHolder.selectCourse(e.target.value)
+        if (e.target.value === '') {
+            loadMoreCourses();
+        } else {
+            tabHolder.selectCourse(e.target.value);
+        }
     });
 
     window.setup_debug = function (element_id, edit_link, staff_context) {
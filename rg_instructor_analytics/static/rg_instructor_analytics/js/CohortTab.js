@@ -10,7 +10,7 @@ function CohortTab(button, content) {
     content.find('#cohort-send-email-btn').click(function () {
 
         function isValid(data) {
-            return !!data.users_ids && !!data.subject && !!data.body
+            return !!data.cohorts && !!data.subject && !!data.body
         }
 
         content.find('.send-email-message').addClass('hidden');
@@ -27,7 +27,8 @@ function CohortTab(button, content) {
         });
 
         let request = {
-            users_ids: ids,
+            thresholds: JSON.stringify(cohortTab.thresholds),
+            cohorts: ids,
             subject: $subject.val(),
             body: $richTextEditor.html(),
         };
@@ -55,8 +56,44 @@ function CohortTab(button, content) {
         });
     });
 
+    /**
+     * Load the next page of the students of the cohort into its list.
+     */
+    function loadStudents(cohortIndex, $students) {
+        function onSuccess(response) {
+            $students.find('.cohort-students-more').remove();
+            for (let i = 0; i < response.students.length; i++) {
+                $students.append(`<li>${response.students[i].username}</li>`);
+            }
+            if (response.next_cursor) {
+                let $more = $(`<li class="cohort-students-more"><a>${django.gettext('Show more')}</a></li>`);
+                $more.find('a').click(() => loadStudents(cohortIndex, $students));
+                $students.append($more);
+            }
+            $students.data('cursor', response.next_cursor);
+        }
+
+        function onError() {
+            alert("Students of the cohort cannot be loaded.");
+        }
+
+        $.ajax({
+            type: "POST",
+            url: "api/cohort/students/",
+            data: {
+                thresholds: JSON.stringify(cohortTab.thresholds),
+                cohort: cohortIndex,
+                cursor: $students.data('cursor') || '',
+            },
+            success: onSuccess,
+            error: onError,
+            dataType: "json"
+        });
+    }
+
     function updateCohort() {
         function onSuccess(response) {
+            cohortTab.thresholds = response.thresholds;
             let plot = {
                 y: response.values,
                 x: response.labels,
@@ -75,28 +112,31 @@ function CohortTab(button, content) {
                                 id="${item}" 
                                 name="cohort-checkbox" 
                                 type="checkbox" 
-                                value="${response.cohorts[i].students_id}"
+                                value="${i}"
                             >
                             <label for="${item}" style="display: inline-block;">${response.labels[i]}</label>
+                            <a class="cohort-students-toggle" data-cohort="${i}">
+                                ${django.gettext('Students')} (${response.cohorts[i].count})
+                            </a>
                         </div>
+                        <ul class="cohort-students hidden"></ul>
                     </li>`
                 )
             }
+            cohortTab.cohortList.find('.cohort-students-toggle').click(function () {
+                let $students = $(this).closest('li').find('.cohort-students');
+                $students.toggleClass('hidden');
+                if (!$students.hasClass('hidden') && $students.children().length === 0) {
+                    loadStudents(this.dataset['cohort'], $students);
+                }
+            });
         }
 
         function onError() {
             alert("Statistics for the select course cannot be loaded.");
         }
 
-        $.ajax({
-            traditional: true,
-            type: "POST",
-            url: "api/cohort/",
-            success: onSuccess,
-            error: onError,
-            dataType: "json"
-        });
-
+        cohortTab.tabHolder.request('cohort', {}, onSuccess, onError);
     }
 
     cohortTab.loadTabData = updateCohort;
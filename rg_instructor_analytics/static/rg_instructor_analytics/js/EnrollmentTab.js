@@ -72,6 +72,9 @@ function EnrollmentTab(button, content) {
             from: fromDate.datepicker("getDate").getTime() / 1000,
             to: toDate.datepicker("getDate").getTime() / 1000
         };
+        // Long ranges are shown by weeks or months.
+        var days = (date.to - date.from) / (60 * 60 * 24);
+        date.period = days > 366 ? 'month' : days > 92 ? 'week' : 'day';
 
         function onSuccess(response) {
             function dataFixFunction(x) {
@@ -206,12 +209,43 @@ function EnrollmentTab(button, content) {
         updateEnrolls();
     }
 
+    /**
+     * Load enrollment info of the selected course, only the info of the initial course is embedded in the page.
+     * @param onLoad - callback, called with the enrollment info
+     */
+    function loadEnrollInfo(onLoad) {
+        let enrollInfo = JSON.parse(periodDiv.attr('data-enroll'));
+        let course = enrollTab.tabHolder.course;
+        if (enrollInfo[course] !== undefined) {
+            onLoad(enrollInfo[course]);
+            return;
+        }
+        enrollTab.tabHolder.request(
+            'course_info',
+            {},
+            function (response) {
+                enrollInfo = JSON.parse(periodDiv.attr('data-enroll'));
+                enrollInfo[response.course_id] = response.enroll_info;
+                periodDiv.attr('data-enroll', JSON.stringify(enrollInfo));
+                if (enrollTab.tabHolder.course === response.course_id) {
+                    onLoad(response.enroll_info);
+                }
+            },
+            function () {
+                alert("Can not load statistic fo select period");
+            }
+        );
+    }
+
     function loadTabData() {
+        loadEnrollInfo(showEnrollInfo);
+    }
+
+    function showEnrollInfo(enrollInfo) {
         let now = new Date();
         let defaultStart = new Date();
         defaultStart.setMonth(defaultStart.getMonth() - 1);
 
-        let enrollInfo = JSON.parse(periodDiv.attr('data-enroll'))[enrollTab.tabHolder.course];
         dateStart = enrollInfo.enroll_start === "null" ? defaultStart : new Date(parseFloat(enrollInfo.enroll_start) * 1000);
         dateEnd = enrollInfo.enroll_end === "null" ? now : new Date(parseFloat(enrollInfo.enroll_end) * 1000);
 
@@ -50,14 +50,7 @@ function FunnelTab(button, content) {
             alert('Can not load statistic for the selected course');
         }
 
-        $.ajax({
-            traditional: true,
-            type: 'POST',
-            url: 'api/funnel/',
-            success: onSuccess,
-            error: onError,
-            dataType: 'json'
-        });
+        funnelTab.tabHolder.request('funnel', {}, onSuccess, onError);
     }
 
     funnelTab.loadTabData = updateFunnel;
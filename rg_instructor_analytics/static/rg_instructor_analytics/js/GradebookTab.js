@@ -11,46 +11,69 @@ function GradebookTab(button, content) {
     greadebookTab.gradebookTableBody = content.find('#gradebook_table_body');
 
     greadebookTab.filterString = '';
+    greadebookTab.sort = 'username';
+    greadebookTab.order = 'asc';
+    greadebookTab.nextCursor = null;
+    greadebookTab.isLoading = false;
+    greadebookTab.studentInfo = [];
+    greadebookTab.studentsNames = [];
     greadebookTab.loadTabData = function () {
         updateData()
     };
 
-    function updateData(filterString = '') {
+    /**
+     * Load the page of the students.
+     * @param filterString string for the students filter
+     * @param cursor cursor of the next page, the first page is loaded and tables are rebuilt if it is absent
+     */
+    function updateData(filterString = '', cursor = null) {
         function onSuccess(response) {
-            greadebookTab.studentInfo = response.student_info;
-            greadebookTab.examNames = response.exam_names;
-            greadebookTab.studentsNames = response.students_names;
-            updateTables()
+            greadebookTab.isLoading = false;
+            greadebookTab.nextCursor = response.next_cursor;
+            if (cursor) {
+                const startIndex = greadebookTab.studentInfo.length;
+                greadebookTab.studentInfo = greadebookTab.studentInfo.concat(response.student_info);
+                greadebookTab.studentsNames = greadebookTab.studentsNames.concat(response.students_names);
+                appendRows(startIndex);
+            } else {
+                greadebookTab.studentInfo = response.student_info;
+                greadebookTab.examNames = response.exam_names;
+                greadebookTab.studentsNames = response.students_names;
+                updateTables();
+            }
         }
 
         function onError() {
+            greadebookTab.isLoading = false;
             alert("Can not load statistic for select course");
         }
 
-        $.ajax({
-            traditional: true,
-            type: "POST",
-            url: "api/gradebook/",
-            data: {filter: filterString},
-            success: onSuccess,
-            error: onError,
-            dataType: "json"
-        });
+        const data = {filter: filterString, sort: greadebookTab.sort, order: greadebookTab.order};
+        if (cursor) {
+            data.cursor = cursor;
+        }
+        greadebookTab.isLoading = true;
+        greadebookTab.tabHolder.request('gradebook', data, onSuccess, onError);
     }
     let inputValue = '';
 
-    function updateTables() {
-        var htmlStringStudents = '';
-        var htmlStringResults = '';
+    function sortLabel(name, title) {
+        let arrow = '';
+        if (greadebookTab.sort === name) {
+            arrow = greadebookTab.order === 'asc' ? ' &#9650;' : ' &#9660;';
+        }
+        return `<div class="assignment-label" data-sort="${name}">${title}${arrow}</div>`;
+    }
 
+    function updateTables() {
         var htmlTemp = `<div class="gradebook-table-cell"><form class="student-search">
-            <input 
-                value="${django.gettext(inputValue)}" 
-                type="search" 
-                class="student-search-field" 
+            <input
+                value="${django.gettext(inputValue)}"
+                type="search"
+                class="student-search-field"
                 placeholder="Search students"
             />
-            </form></div>`;
+            </form>${sortLabel('username', django.gettext('Username'))}</div>`;
 
         greadebookTab.gradebookTableHeader.empty();
         greadebookTab.gradebookTableBody.empty();
@@ -58,7 +81,7 @@ function GradebookTab(button, content) {
         for (var i = 0; i < greadebookTab.examNames.length; i++) {
             htmlTemp += `
                 <div class="gradebook-table-cell">
-                    <div class="assignment-label">${greadebookTab.examNames[i]}</div>
+                    ${sortLabel(greadebookTab.examNames[i], greadebookTab.examNames[i])}
                 </div>
             `;
         }
@@ -82,9 +105,24 @@ function GradebookTab(button, content) {
             e.target.value = inputValue;
         });
 
+        greadebookTab.gradebookTableHeader.find('.assignment-label').click(function () {
+            const sort = this.dataset['sort'];
+            greadebookTab.order = greadebookTab.sort === sort && greadebookTab.order === 'asc' ? 'desc' : 'asc';
+            greadebookTab.sort = sort;
+            updateData(inputValue);
+        });
+
         greadebookTab.studentsTable.empty();
+        appendRows(0);
+    }
 
-        for (var i = 0; i < greadebookTab.studentInfo.length; i++) {
+    /**
+     * Append rows of the loaded students, starting from the given position.
+     */
+    function appendRows(startIndex) {
+        var htmlStringStudents = '';
+
+        for (var i = startIndex; i < greadebookTab.studentInfo.length; i++) {
             var htmlStringResults = '';
             for (var nameIndex = 0; nameIndex < greadebookTab.examNames.length; nameIndex++) {
                 htmlStringResults += `
@@ -119,50 +157,60 @@ function GradebookTab(button, content) {
         $tableCells.each((item) => {
             $tableCells[item].style.flex = `0 0 ${maxLength}px`;
         });
-
-        $(greadebookTab.gradebookTableBody).click(function (element) {
-            let colorArray = greadebookTab.examNames.map((item, idx, arr) => {
-                if (idx === arr.length - 1) {
-                    return '#c14f84';
-                }
-                return '#568ecc';
-            });
-
-            let studentsGrades = [];
-            const studentPosition = element.target.dataset['position'];
-            for (var nameIndex = 0; nameIndex < greadebookTab.examNames.length; nameIndex++)
-                studentsGrades.push(greadebookTab.studentInfo[studentPosition][greadebookTab.examNames[nameIndex]])
-
-            var stat = {
-                y: studentsGrades,
-                x: greadebookTab.examNames,
-                type: 'bar',
-                marker:{
-                    color: colorArray
-                },
-                width: 0.6,
-            };
-            var data = [stat];
-
-            var layout = {
-                title: greadebookTab.studentInfo[element.target.dataset['position']].username,
-                showlegend: false,
-                xaxis: {domain: [0, 0.97]},
-            };
-            $('.gradebook-table-row').removeClass('active');
-            $(element.target).closest('.gradebook-table-row').toggleClass('active');
-            $('.enrollment-title-1.hidden').removeClass('hidden');
-            $('.enrollment-title-text-1.hidden').removeClass('hidden');
-            Plotly.newPlot('gradebook-stats-plot', data, layout, {displayModeBar: false});
-        })
     }
+
+    greadebookTab.gradebookTableBody.click(function (element) {
+        const studentPosition = element.target.dataset['position'];
+        if (studentPosition === undefined) {
+            return;
+        }
+        let colorArray = greadebookTab.examNames.map((item, idx, arr) => {
+            if (idx === arr.length - 1) {
+                return '#c14f84';
+            }
+            return '#568ecc';
+        });
+
+        let studentsGrades = [];
+        for (var nameIndex = 0; nameIndex < greadebookTab.examNames.length; nameIndex++)
+            studentsGrades.push(greadebookTab.studentInfo[studentPosition][greadebookTab.examNames[nameIndex]])
+
+        var stat = {
+            y: studentsGrades,
+            x: greadebookTab.examNames,
+            type: 'bar',
+            marker:{
+                color: colorArray
+            },
+            width: 0.6,
+        };
+        var data = [stat];
+
+        var layout = {
+            title: greadebookTab.studentsNames[studentPosition],
+            showlegend: false,
+            xaxis: {domain: [0, 0.97]},
+        };
+        $('.gradebook-table-row').removeClass('active');
+        $(element.target).closest('.gradebook-table-row').toggleClass('active');
+        $('.enrollment-title-1.hidden').removeClass('hidden');
+        $('.enrollment-title-text-1.hidden').removeClass('hidden');
+        Plotly.newPlot('gradebook-stats-plot', data, layout, {displayModeBar: false});
+    });
+
     let $tbody = $('#gradebook_table_body');
     $tbody.on('scroll',() => {
 
         let scrollLeft = $tbody.scrollLeft();
-    
+
         $('#gradebook_table_header').css("left", -scrollLeft);
-        $('.gradebook-table-cell:first-child').css("left", scrollLeft)
+        $('.gradebook-table-cell:first-child').css("left", scrollLeft);
+
+        // Load the next page, when the table is scrolled to the bottom.
+        const nearBottom = $tbody[0].scrollTop + $tbody[0].clientHeight >= $tbody[0].scrollHeight - 20;
+        if (nearBottom && greadebookTab.nextCursor && !greadebookTab.isLoading) {
+            updateData(inputValue, greadebookTab.nextCursor);
+        }
     });
     return greadebookTab;
 }
@@ -113,15 +113,7 @@ function ProblemTab(button, content) {
             alert("Can not load statistic for select course");
         }
 
-        $.ajax({
-            traditional: true,
-            type: "POST",
-            url: "api/problem_statics/homework/",
-            data: {},
-            success: onSuccess,
-            error: onError,
-            dataType: "json"
-        });
+        problemTab.tabHolder.request('problem_statics/homework', {}, onSuccess, onError);
     }
 
     /**
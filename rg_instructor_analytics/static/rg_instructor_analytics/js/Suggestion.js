@@ -36,15 +36,9 @@ function SuggestionTab(button, content) {
             alert("Can not load statistic for select course");
         };
 
-        $.ajax({
-            traditional: true,
-            type: 'POST',
-            url: 'api/suggestion/',  // TODO remove hardcore
-            success: onSuggestionLoad,
-            error: onSuggestionLoadError,
-            data: {intent: 'get_norm_list'},
-            dataType: 'json'
-        });
+        suggestionTab.tabHolder.request(
+            'suggestion', {intent: 'get_norm_list'}, onSuggestionLoad, onSuggestionLoadError
+        );
     };
 
     return suggestionTab;
@@ -33,10 +33,73 @@ function TabHolder(tabs, course) {
         this.toggleToTab(location.value);
     };
 
+    /**
+     * Load several apis of the current course by the single request.
+     * @param requests - list of `{widget: <api path after "api/", i.e. "cohort">, params: {...}}`
+     * @returns promise, resolved with the list of `{status, data}` in the order of the requests
+     */
+    this.batch = (requests) => {
+        return $.ajax({
+            type: 'POST',
+            url: 'api/batch/',
+            data: {requests: JSON.stringify(requests)},
+            dataType: 'json'
+        }).then(response => response.results);
+    };
+
+    /**
+     * Send request to the api of the current course.
+     * Requests of the tabs, loaded together by `loadTabs`, are collected and sent by the single batch request.
+     * @param widget - api path after "api/", i.e. "cohort"
+     * @param params - parameters of the request
+     * @param success - callback, called with the json response
+     * @param error - callback, called when the request is failed
+     */
+    this.request = (widget, params, success, error) => {
+        if (this.pendingRequests !== undefined) {
+            this.pendingRequests.push({widget: widget, params: params, success: success, error: error});
+            return;
+        }
+        $.ajax({
+            traditional: true,
+            type: 'POST',
+            url: `api/${widget}/`,
+            data: params,
+            success: success,
+            error: error,
+            dataType: 'json'
+        });
+    };
+
+    /**
+     * Load data of the given tabs by the single batch request.
+     * @param tabNames - names of the tabs
+     */
+    this.loadTabs = (tabNames) => {
+        const requests = [];
+        this.pendingRequests = requests;
+        try {
+            tabNames.forEach(tabName => this.tabs[tabName].loadTabData());
+        } finally {
+            this.pendingRequests = undefined;
+        }
+        if (requests.length === 0) {
+            return;
+        }
+        this.batch(requests.map(request => ({widget: request.widget, params: request.params}))).then(
+            results => results.forEach((result, index) => {
+                if (result.status === 200) {
+                    requests[index].success(result.data);
+                } else {
+                    requests[index].error();
+                }
+            }),
+            () => requests.forEach(request => request.error())
+        );
+    };
+
     this.selectCourse = (course) => {
         this.course = course;
-        for (let tabName in this.tabs) {
-            this.tabs[tabName].loadTabData()
-        }
+        this.loadTabs(Object.keys(this.tabs));
     }
 }
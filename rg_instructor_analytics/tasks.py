@@ -3,21 +3,27 @@ Module for celery tasks.
 """
 from collections import OrderedDict
 from datetime import datetime
+from itertools import groupby
 import json
 import logging
+from operator import itemgetter, or_
+from smtplib import SMTPRecipientsRefused
 
+from celery import chord
 from celery.schedules import crontab
 from celery.task import periodic_task, task
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.exceptions import PermissionDenied
-from django.core.mail import EmailMultiAlternatives
+from django.core.mail import EmailMultiAlternatives, get_connection
 from django.db import transaction
-from django.db.models import F
+from django.db.models import Count, Sum
 from django.db.models.expressions import RawSQL
 from django.db.models.query_utils import Q
 from django.http.response import Http404
 from django.template.loader import render_to_string
+from django.utils import timezone
 from django.utils.html import strip_tags
 from opaque_keys import InvalidKeyError
 from opaque_keys.edx.keys import CourseKey
@@ -25,8 +31,23 @@ from opaque_keys.edx.keys import CourseKey
 from courseware.courses import get_course_by_id
 from courseware.models import StudentModule
 from lms import CELERY_APP
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 from openedx.core.djangoapps.site_configuration import helpers as configuration_helpers
-from rg_instructor_analytics.models import EnrollmentByStudent, EnrollmentTabCache, GradeStatistic, LastGradeStatUpdate
+from rg_instructor_analytics.models import (
+    CohortEmail, CohortEmailBatch, CollectorCheckpoint, EnrollmentByStudent, EnrollmentSeries, EnrollmentTabCache,
+    GradeStatistic, GradeStatisticItem, LastVisitedSubsection, PendingGradeUpdate, ProblemStatistic
+)
+from rg_instructor_analytics.signals import GRADE_STAT_EVENTS
+from rg_instructor_analytics.utils.cohort import cohort_filter
+from rg_instructor_analytics.utils.course_structure import get_course_versions
+from rg_instructor_analytics.utils.db import bulk_upsert, iter_batches, keys_filter, QueryCounter
+from rg_instructor_analytics.utils.response_cache import get_generations, invalidate_course_responses
+from rg_instructor_analytics.utils.search import get_search_text, update_search_index
+from rg_instructor_analytics.utils.series import DaySeries
+from rg_instructor_analytics.utils.snapshot import get_snapshot_key, SNAPSHOT_TIMEOUT
+from rg_instructor_analytics.utils.state import get_state_field, get_state_fields
+from rg_instructor_analytics.utils.suggestion import build_course_suggestions
+from rg_instructor_analytics.utils.watermark import get_watermark_storage
 from student.models import CourseEnrollment
 from xmodule.modulestore.django import modulestore
 
@@ -38,21 +59,95 @@ except ImportError:
 
 log = logging.getLogger(__name__)
 DEFAULT_DATE_TIME = datetime(2000, 1, 1, 0, 0)
+DATE_TIME_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
+
+
+COHORT_EMAIL_BATCH_SIZE = getattr(settings, 'RG_ANALYTICS_COHORT_EMAIL_BATCH_SIZE', 100)
+COHORT_EMAIL_RATE_LIMIT = getattr(settings, 'RG_ANALYTICS_COHORT_EMAIL_RATE_LIMIT', '10/m')
+COHORT_EMAIL_MAX_RETRIES = getattr(settings, 'RG_ANALYTICS_COHORT_EMAIL_MAX_RETRIES', 5)
+COHORT_EMAIL_RETRY_DELAY = 60
 
 
 @CELERY_APP.task
-def send_email_to_cohort(subject, message, students):
+def send_email_to_cohort(course_string_id, thresholds, cohorts, subject, message):
     """
-    Send email task.
+    Send email to the students of the cohorts with the given indexes.
+
+    Message is rendered once, recipients are resolved by the task and split into the batches of
+    `COHORT_EMAIL_BATCH_SIZE` addresses, each batch is delivered by the separate rate limited task.
     """
+    course_key = CourseKey.from_string(course_string_id)
+    cohorts_filter = Q()
+    for index in cohorts:
+        cohorts_filter |= cohort_filter(thresholds, index)
+
     context = {'subject': subject, 'body': message}
     html_content = render_to_string('rg_instructor_analytics/cohort_email_temolate.html', context)
-    text_content = strip_tags(html_content)
-    from_address = configuration_helpers.get_value('email_from_address', settings.DEFAULT_FROM_EMAIL)
-    msg = EmailMultiAlternatives(subject, text_content, from_address, students)
-    msg.encoding = 'UTF-8'
-    msg.attach_alternative(html_content, "text/html")
-    msg.send(fail_silently=False)
+    email = CohortEmail.objects.create(
+        course_id=course_key,
+        subject=subject,
+        from_address=configuration_helpers.get_value('email_from_address', settings.DEFAULT_FROM_EMAIL),
+        text_content=strip_tags(html_content),
+        html_content=html_content,
+    )
+    recipients = (
+        GradeStatistic.objects
+        .filter(cohorts_filter, course_id=course_key)
+        .exclude(student__email='')
+        .order_by('student_id')
+        .values_list('student__email', flat=True)
+        .iterator()
+    )
+    for recipients_batch in iter_batches(recipients, COHORT_EMAIL_BATCH_SIZE):
+        batch = CohortEmailBatch.objects.create(email=email, recipients=json.dumps(recipients_batch))
+        send_cohort_email_batch.delay(batch.id)
+
+
+@CELERY_APP.task(bind=True, rate_limit=COHORT_EMAIL_RATE_LIMIT, max_retries=COHORT_EMAIL_MAX_RETRIES)
+def send_cohort_email_batch(self, batch_id):
+    """
+    Deliver the batch of the cohort email, one message per recipient over the single SMTP connection.
+
+    Count of the delivered recipients is stored after each message, so the retried task (or the task of the
+    restarted worker) does not send the message twice. Recipients, refused by the mail server, are skipped.
+    Batch is marked as failed, when the retries are exceeded.
+    """
+    batch = CohortEmailBatch.objects.select_related('email').get(id=batch_id)
+    if batch.finished or batch.failed:
+        return
+
+    email = batch.email
+    recipients = json.loads(batch.recipients)
+    connection = get_connection()
+    batch.attempts += 1
+    batch.save(update_fields=['attempts'])
+    try:
+        connection.open()
+        for address in recipients[batch.sent_count:]:
+            msg = EmailMultiAlternatives(email.subject, email.text_content, email.from_address, [address])
+            msg.encoding = 'UTF-8'
+            msg.attach_alternative(email.html_content, "text/html")
+            try:
+                connection.send_messages([msg])
+            except SMTPRecipientsRefused:
+                log.warning('Cohort email %s is refused for the recipient %s', email.id, address)
+            batch.sent_count += 1
+            CohortEmailBatch.objects.filter(id=batch.id).update(sent_count=batch.sent_count)
+    except Exception as exc:
+        if self.request.retries >= self.max_retries:
+            batch.failed = datetime.now()
+            batch.save(update_fields=['failed'])
+            log.exception(
+                'Batch %s of the cohort email %s is failed after %s attempts', batch.id, email.id, batch.attempts
+            )
+            raise
+        log.exception('Unable to deliver the batch %s of the cohort email %s', batch.id, email.id)
+        raise self.retry(exc=exc, countdown=COHORT_EMAIL_RETRY_DELAY * batch.attempts)
+    finally:
+        connection.close()
+
+    batch.finished = datetime.now()
+    batch.save(update_fields=['finished'])
 
 
 cron_enroll_settings = getattr(
@@ -62,52 +157,133 @@ cron_enroll_settings = getattr(
     }
 )
 
+ENROLLMENT_HISTORY_CHUNK_SIZE = getattr(settings, 'RG_ANALYTICS_ENROLLMENT_HISTORY_CHUNK_SIZE', 10000)
+ENROLLMENT_CHECKPOINT = 'enrollment_collector_date'
 
-@periodic_task(run_every=crontab(**cron_enroll_settings))
-def enrollment_collector_date():
+
+def get_enrollment_states(keys):
     """
-    Task for update enrollment statistic.
+    Return stored enrollment state for the given `(course_key, student)` keys.
+    """
+    users_state = {}
+    for batch in iter_batches(keys):
+        enrollments = (
+            EnrollmentByStudent.objects
+            .filter(keys_filter(('course_id', 'student'), batch))
+            .values('course_id', 'student', 'last_update', 'state')
+        )
+        for enrol in enrollments:
+            users_state[enrol['course_id'], enrol['student']] = {
+                'last_update': enrol['last_update'],
+                'state': enrol['state'],
+            }
+    return users_state
+
+
+def get_last_enrollment_stat(course_keys):
+    """
+    Return the latest day of the enrollment tab cache for each of the given courses.
+    """
+    return EnrollmentTabCache.objects.filter(
+        course_id__in=course_keys,
+        created__exact=RawSQL(
+            "(SELECT MAX(t2.created) FROM rg_instructor_analytics_enrollmenttabcache t2 " +
+            "WHERE (t2.course_id = rg_instructor_analytics_enrollmenttabcache.course_id))", ())
+    )
+
+
+def get_enrollment_checkpoint():
+    """
+    Return `(history_date, history_id)` of the last processed enrollment history record.
+
+    `history_id` is None, when the collector should continue strictly after the `history_date`.
+    """
+    checkpoint = CollectorCheckpoint.objects.filter(name=ENROLLMENT_CHECKPOINT).first()
+    if checkpoint:
+        return checkpoint.last_update, checkpoint.last_id
+    # Statistic, collected before checkpoints were introduced, continues from the latest stored enrollment state.
+    last_stat = EnrollmentByStudent.objects.all().order_by('-last_update').first()
+    return (last_stat.last_update if last_stat else DEFAULT_DATE_TIME), None
+
+
+def iter_enrollment_history_chunks(last_update, last_id, chunk_size=ENROLLMENT_HISTORY_CHUNK_SIZE):
+    """
+    Generate chunks of the enrollment history, that are newer than the given position.
+
+    Keyset pagination over `(history_date, history_id)` is used instead of the one big queryset,
+    so only one chunk is loaded into memory at a time.
     """
-    last_stat = EnrollmentByStudent.objects.all().order_by('-last_update')
-    if last_stat.exists():
-        last_update = last_stat.first().last_update
-    else:
-        last_update = DEFAULT_DATE_TIME
     enrollments_history = (
         CourseEnrollment.history
         .filter(~Q(history_type='+'))
-        .filter(history_date__gt=last_update)
-        .values("history_date", "is_active", "user", "course_id")
-        .order_by('history_date')
+        .values("history_id", "history_date", "is_active", "user", "course_id")
+        .order_by('history_date', 'history_id')
     )
-    users_state = {
-        (enrol['student'], enrol['course_id']): {'last_update': enrol['last_update'], 'state': enrol['state']}
-        for enrol in EnrollmentByStudent.objects.all().values("course_id", "student", "last_update", "state", )
+    while True:
+        if last_id is None:
+            position = Q(history_date__gt=last_update)
+        else:
+            position = Q(history_date__gt=last_update) | Q(history_date=last_update, history_id__gt=last_id)
+        chunk = list(enrollments_history.filter(position)[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        last_update, last_id = chunk[-1]['history_date'], chunk[-1]['history_id']
+
+
+def update_enrollment_series(series_changes):
+    """
+    Add changes of the enrollments, given as `{course_key: {day: [enroll, unenroll]}}`, to the series of the courses.
+
+    Should be called inside of the transaction.
+    """
+    course_series = {
+        series.course_id: series
+        for series in EnrollmentSeries.objects.select_for_update().filter(course_id__in=list(series_changes))
     }
+    for course_key, changes in series_changes.iteritems():
+        series = course_series.get(course_key) or EnrollmentSeries(course_id=course_key)
+        enroll = DaySeries.unpack(series.start, series.enroll)
+        unenroll = DaySeries.unpack(series.start, series.unenroll)
+        first_day, last_day = min(changes), max(changes)
+        enroll.add({day: change[0] for day, change in changes.iteritems()}, first_day, last_day)
+        unenroll.add({day: change[1] for day, change in changes.iteritems()}, first_day, last_day)
+        series.start, series.enroll, series.unenroll = enroll.start, enroll.pack(), unenroll.pack()
+        series.save()
+
+
+def collect_enrollment_history_chunk(enrollments_history):
+    """
+    Update enrollment statistic with the given chunk of the enrollment history.
 
-    result_stat = {}
+    Only users and days, touched by the chunk, are read and written.
+    """
+    course_keys = {}
+    for history_item in enrollments_history:
+        course_id = history_item['course_id']
+        if course_id not in course_keys:
+            course_keys[course_id] = course_id if isinstance(course_id, CourseKey) else CourseKey.from_string(course_id)
+        history_item['course_id'] = course_keys[course_id]
 
-    exist_stat = EnrollmentTabCache.objects.filter(
-        created__exact=RawSQL(
-            "(SELECT MAX(t2.created) FROM rg_instructor_analytics_enrollmenttabcache t2 " +
-            "WHERE (t2.course_id = rg_instructor_analytics_enrollmenttabcache.course_id))", ())
-    )
+    users_state = get_enrollment_states({(item['course_id'], item['user']) for item in enrollments_history})
+    changed_users = {}
 
+    result_stat = {}
     total_stat = {}
-    if exist_stat.exists():
-        for stat in exist_stat:
-            result_stat[stat.created, str(stat.course_id)] = {
-                'unenroll': stat.unenroll,
-                'enroll': stat.enroll,
-                'total': stat.total,
-            }
-            total_stat[str(stat.course_id)] = stat.total
+    series_changes = {}
+    for stat in get_last_enrollment_stat(course_keys.values()):
+        result_stat[stat.created, stat.course_id] = {
+            'unenroll': stat.unenroll,
+            'enroll': stat.enroll,
+            'total': stat.total,
+        }
+        total_stat[stat.course_id] = stat.total
 
     for history_item in enrollments_history:
-        key = history_item['user'], history_item['course_id']
+        key = history_item['course_id'], history_item['user']
         if key in users_state and users_state[key]['state'] == history_item['is_active']:
             continue
-        users_state[key] = {
+        users_state[key] = changed_users[key] = {
             'last_update': history_item['history_date'],
             'state': history_item['is_active'],
         }
@@ -127,65 +303,146 @@ def enrollment_collector_date():
         result_stat[total_key]['unenroll'] += unenroll
         result_stat[total_key]['enroll'] += enroll
         result_stat[total_key]['total'] = total_stat[history_item['course_id']]
+        day_changes = series_changes.setdefault(history_item['course_id'], {}).setdefault(total_key[0], [0, 0])
+        day_changes[0] += enroll
+        day_changes[1] += unenroll
 
     with transaction.atomic():
-        for (user, course), value in users_state.iteritems():
-            EnrollmentByStudent.objects.update_or_create(
-                course_id=CourseKey.from_string(course), student=user,
-                defaults={'last_update': value['last_update'], 'state': value['state']},
-            )
+        bulk_upsert(
+            EnrollmentByStudent,
+            (
+                {'course_id': course, 'student': user, 'last_update': value['last_update'], 'state': value['state']}
+                for (course, user), value in changed_users.iteritems()
+            ),
+            key_fields=('course_id', 'student'),
+            update_fields=('last_update', 'state'),
+        )
+        bulk_upsert(
+            EnrollmentTabCache,
+            (
+                dict(value, course_id=course, created=date)
+                for (date, course), value in result_stat.iteritems()
+            ),
+            key_fields=('course_id', 'created'),
+            update_fields=('unenroll', 'enroll', 'total'),
+        )
+        update_enrollment_series(series_changes)
+        last_item = enrollments_history[-1]
+        CollectorCheckpoint.objects.update_or_create(
+            name=ENROLLMENT_CHECKPOINT,
+            defaults={'last_update': last_item['history_date'], 'last_id': last_item['history_id']},
+        )
 
-        for (date, course), value in result_stat.iteritems():
-            EnrollmentTabCache.objects.update_or_create(
-                course_id=CourseKey.from_string(course), created=date,
-                defaults={
-                    'unenroll': value['unenroll'],
-                    'enroll': value['enroll'],
-                    'total': value['total'],
-                },
-            )
+    for course_key in course_keys.values():
+        invalidate_course_responses(course_key)
 
 
-def get_items_for_grade_update():
+@periodic_task(run_every=crontab(**cron_enroll_settings))
+def enrollment_collector_date():
     """
-    Return an aggregate list of the users by the course, those grades need to be recalculated.
-    """
-    last_update_info = LastGradeStatUpdate.objects.all()
-    # For first update we what get statistic for all enrollments,
-    # otherwise - generate diff, based on the student activity.
-    if last_update_info.exists():
-        items_for_update = (
-            StudentModule.objects
-            .filter(module_type__exact='problem', modified__gt=last_update_info.last().last_update)
-            .values('student__id', 'course_id')
-            .order_by('student__id', 'course_id')
-            .distinct()
-        )
-    else:
-        items_for_update = (
-            CourseEnrollment.objects
-            .filter(is_active=True)
-            .values('user__id', 'course_id')
-            .order_by('user__id', 'course_id')
-            .distinct()
-            .annotate(student__id=F('user__id'))
-            .values('student__id', 'course_id')
-        )
+    Task for update enrollment statistic.
+
+    History is processed in chunks, each chunk is committed together with the checkpoint,
+    so an interrupted run is resumed from the last committed chunk.
+    """
+    last_update, last_id = get_enrollment_checkpoint()
+    for enrollments_history in iter_enrollment_history_chunks(last_update, last_id):
+        collect_enrollment_history_chunk(enrollments_history)
+
+
+GRADE_UPDATE_COURSES_CHUNK_SIZE = 100
+# Course level statistics, that are collected for all students of the course, when the course has not been
+# backfilled yet (i.e. the course has been collected before the statistic was introduced).
+COURSE_BACKFILL_STATS = ('problem_stat', 'funnel_stat')
+BACKFILL_CHECKPOINT = '{stat}_backfill:{course}'
+
+
+def get_pending_backfills(course_keys):
+    """
+    Return course level statistics, those backfill is not done yet, by the course.
+    """
+    names = {
+        BACKFILL_CHECKPOINT.format(stat=stat, course=course_key): (course_key, stat)
+        for course_key in course_keys for stat in COURSE_BACKFILL_STATS
+    }
+    done = set(CollectorCheckpoint.objects.filter(name__in=names.keys()).values_list('name', flat=True))
+    pending = {}
+    for name, (course_key, stat) in names.iteritems():
+        if name not in done:
+            pending.setdefault(course_key, set()).add(stat)
+    return pending
 
+
+def get_changed_users(watermarks):
+    """
+    Return students, that changed the problems after the watermark of the course, by the changed course.
+
+    Course with activity outside of the problems (i.e. navigation) is returned with empty list of the users.
+    """
+    changes = StudentModule.objects.filter(reduce(or_, [
+        Q(course_id=course_key, modified__gt=watermark) for course_key, watermark in watermarks.items()
+    ]))
+    users_by_course = {course_key: set() for course_key in changes.values_list('course_id', flat=True).distinct()}
+    problem_changes = changes.filter(module_type__exact='problem').values_list('course_id', 'student_id').distinct()
+    for course_key, user_id in problem_changes:
+        users_by_course[course_key].add(user_id)
+    return users_by_course
+
+
+def get_enrolled_users(course_keys):
+    """
+    Return active enrollments by the course.
+    """
     users_by_course = {}
-    for item in items_for_update:
-        if item['course_id'] not in users_by_course:
-            users_by_course[item['course_id']] = []
-        users_by_course[item['course_id']].append(item['student__id'])
+    enrollments = (
+        CourseEnrollment.objects
+        .filter(course_id__in=course_keys, is_active=True)
+        .values_list('course_id', 'user_id')
+        .distinct()
+    )
+    for course_key, user_id in enrollments:
+        users_by_course.setdefault(course_key, set()).add(user_id)
     return users_by_course
 
 
-def get_grade_summary(user_id, course):
+def get_items_for_grade_update():
+    """
+    Return an aggregate list of the users by the course, those grades need to be recalculated, and course watermarks.
+
+    Each course is checked from its own watermark, so a failed or a newly added course
+    does not affect the update window of the other courses. Courses are checked in chunks,
+    with one query for the watermarks, the changes, the backfills and the enrollments of each chunk.
+    New course without the enrollments is returned with the empty list of the users, so it gets its watermark.
+    """
+    course_keys = list(CourseOverview.objects.values_list('id', flat=True))
+    storage = get_watermark_storage()
+
+    watermarks = {}
+    users_by_course = {}
+    for course_keys_chunk in iter_batches(course_keys, GRADE_UPDATE_COURSES_CHUNK_SIZE):
+        chunk_watermarks = storage.get_many(course_keys_chunk)
+        watermarks.update(chunk_watermarks)
+        # For first update of the course we what get statistic for all enrollments,
+        # otherwise - generate diff, based on the student activity.
+        if chunk_watermarks:
+            users_by_course.update(get_changed_users(chunk_watermarks))
+            # Course without the activity is updated too, when its course level statistic is not backfilled.
+            for course_key in get_pending_backfills(chunk_watermarks.keys()):
+                users_by_course.setdefault(course_key, set())
+        new_courses = [course_key for course_key in course_keys_chunk if course_key not in chunk_watermarks]
+        if new_courses:
+            users_by_course.update(get_enrolled_users(new_courses))
+            for course_key in new_courses:
+                users_by_course.setdefault(course_key, set())
+    return {course_key: sorted(users) for course_key, users in users_by_course.items()}, watermarks
+
+
+def get_grade_summary(user, course):
     """
     Return the grade for the given student in the addressed course.
     """
     try:
-        return CourseGradeFactory().create(User.objects.all().filter(id=user_id).first(), course).summary
+        return CourseGradeFactory().create(user, course).summary
     except PermissionDenied:
         return None
 
@@ -197,46 +454,399 @@ cron_grade_settings = getattr(
     }
 )
 
+GRADE_STAT_FAN_OUT = getattr(settings, 'RG_ANALYTICS_GRADE_STAT_FAN_OUT', False)
+GRADE_STAT_USERS_CHUNK_SIZE = getattr(settings, 'RG_ANALYTICS_GRADE_STAT_USERS_CHUNK_SIZE', 500)
+GRADE_STAT_COUNT_QUERIES = getattr(settings, 'RG_ANALYTICS_GRADE_STAT_COUNT_QUERIES', False)
+GRADE_EVENTS_BATCH_SIZE = getattr(settings, 'RG_ANALYTICS_GRADE_EVENTS_BATCH_SIZE', 500)
+cron_grade_events_settings = getattr(
+    settings, 'RG_ANALYTICS_GRADE_EVENTS_FLUSH',
+    {
+        'minute': '*',
+    }
+)
+QUESTION_ANSWERS_LIMIT = getattr(settings, 'RG_ANALYTICS_QUESTION_ANSWERS_LIMIT', 100)
+
+
+def get_grade_stat_rows(course_key, course, users, query_counter):
+    """
+    Generate rows of the `GradeStatistic` for the given users of the course.
+
+    Users are fetched in bulk for each chunk together with their profiles, so grading of the student
+    does not require extra user lookup. Fields of the users are not deferred, because the grading reads them lazily.
+    """
+    for users_chunk in iter_batches(users, GRADE_STAT_USERS_CHUNK_SIZE):
+        users_by_id = User.objects.select_related('profile').in_bulk(users_chunk)
+        for user_id in users_chunk:
+            if user_id not in users_by_id:
+                continue
+            with query_counter.count():
+                grades = get_grade_summary(users_by_id[user_id], course)
+            if not grades:
+                continue
+            exam_info = OrderedDict()
+            for grade in grades['section_breakdown']:
+                exam_info[grade['label']] = int(grade['percent'] * 100.0)
+            exam_info['total'] = int(grades['percent'] * 100.0)
+
+            yield {
+                'course_id': course_key,
+                'student_id': user_id,
+                'exam_info': json.dumps(exam_info),
+                'total': grades['percent'],
+                'search_text': get_search_text(users_by_id[user_id]),
+            }
+
+
+def get_grade_item_rows(course_key, users):
+    """
+    Generate rows of the `GradeStatisticItem` from the grade statistic of the given users of the course.
+    """
+    decoder = json.JSONDecoder(object_pairs_hook=OrderedDict)
+    stats = (
+        GradeStatistic.objects
+        .filter(course_id=course_key, student_id__in=users)
+        .values_list('student_id', 'exam_info')
+    )
+    for student, exam_info in stats:
+        for position, (label, percent) in enumerate(decoder.decode(exam_info).iteritems()):
+            yield {
+                'course_id': course_key,
+                'student': student,
+                'label': label,
+                'percent': percent,
+                'position': position,
+            }
+
+
+def collect_course_grade_items(course_key, users):
+    """
+    Update per-assignment grades of the given users of the course.
+
+    Grades of the assignments, that have been removed from the grading policy of the course, are deleted.
+    """
+    for users_chunk in iter_batches(users):
+        rows = list(get_grade_item_rows(course_key, users_chunk))
+        bulk_upsert(
+            GradeStatisticItem,
+            rows,
+            key_fields=('course_id', 'student', 'label'),
+            update_fields=('percent', 'position'),
+        )
+        stale_items = GradeStatisticItem.objects.filter(course_id=course_key, student__in=users_chunk)
+        stale_items.exclude(label__in={row['label'] for row in rows}).delete()
+
+
+def collect_course_grade_stat(course_string_id, users):
+    """
+    Update grade statistic of the given users in the course.
+
+    Return counter of the queries, issued for grading of the students.
+    """
+    query_counter = QueryCounter(enabled=GRADE_STAT_COUNT_QUERIES)
+    try:
+        course_key = CourseKey.from_string(course_string_id)
+        course = get_course_by_id(course_key, depth=0)
+    except (InvalidKeyError, Http404):
+        return query_counter
+
+    with modulestore().bulk_operations(course_key):
+        bulk_upsert(
+            GradeStatistic,
+            get_grade_stat_rows(course_key, course, users, query_counter),
+            key_fields=('course_id', 'student_id'),
+            update_fields=('exam_info', 'total', 'search_text'),
+        )
+    collect_course_grade_items(course_key, users)
+    update_search_index(course_key, users)
+
+    if query_counter.enabled:
+        log.info(
+            'Grade statistic of the course %s: %d students graded with %.2f queries per student',
+            course_key, query_counter.calls, query_counter.per_call
+        )
+    return query_counter
+
+
+def get_touched_problems(course_key, since):
+    """
+    Return ids of the course problems, that have been changed after the given time (all problems if time is None).
+    """
+    problems = StudentModule.objects.filter(course_id=course_key, module_type__exact='problem')
+    if since is not None:
+        problems = problems.filter(modified__gt=since)
+    return list(problems.values_list('module_state_key', flat=True).order_by('module_state_key').distinct())
+
+
+def get_problem_states_stat(states):
+    """
+    Return statistic of the attempts and histograms of the answers for each question of the problem.
+
+    Only `attempts` and `student_answers` fields are decoded from the states.
+
+    :param states: iterable with states of the problem for each student.
+    :return: dict with `attempts_sum`, `attempts_count` and `answers` - map, where key - question id and
+        value - map of the answer to count of the students, choices of the multiple choice answers are counted
+        separately. Histograms with more than `RG_ANALYTICS_QUESTION_ANSWERS_LIMIT` answers
+        (i.e. free text questions) are not collected and are represented with None.
+    """
+    attempts_sum, attempts_count, histograms = 0, 0, {}
+    for state in states:
+        fields = get_state_fields(state, ('attempts', 'student_answers'))
+        if isinstance(fields.get('attempts'), int):
+            attempts_sum += fields['attempts']
+            attempts_count += 1
+        for question, answers in fields.get('student_answers', {}).iteritems():
+            histogram = histograms.setdefault(question, {})
+            if histogram is None:
+                continue
+            for answer in (answers if isinstance(answers, list) else [answers]):
+                if isinstance(answer, (basestring, int, float)):
+                    answer = unicode(answer)
+                    histogram[answer] = histogram.get(answer, 0) + 1
+            if len(histogram) > QUESTION_ANSWERS_LIMIT:
+                histograms[question] = None
+    return {'attempts_sum': attempts_sum, 'attempts_count': attempts_count, 'answers': histograms}
+
+
+def get_problem_stat_rows(course_key, problems):
+    """
+    Generate rows of the `ProblemStatistic` for the given problems of the course.
+
+    Grades are aggregated by the database, while attempts and answers are taken from the states
+    of the problem in the single pass.
+    """
+    for problems_chunk in iter_batches(problems):
+        submissions = StudentModule.objects.filter(
+            course_id=course_key, module_state_key__in=problems_chunk, grade__isnull=False
+        )
+        stats = (
+            submissions
+            .values('module_state_key')
+            .annotate(sum_grade=Sum('grade'), sum_max_grade=Sum('max_grade'), submissions_count=Count('id'))
+            .values('module_state_key', 'sum_grade', 'sum_max_grade', 'submissions_count')
+        )
+        states = (
+            submissions
+            .values_list('module_state_key', 'state')
+            .order_by('module_state_key')
+            .iterator()
+        )
+        states_stat = {
+            problem: get_problem_states_stat(state for _, state in problem_states)
+            for problem, problem_states in groupby(states, key=itemgetter(0))
+        }
+        for stat in stats:
+            state_stat = states_stat.get(stat['module_state_key'], {'attempts_sum': 0, 'attempts_count': 0})
+            stat['course_id'] = course_key
+            stat['attempts_sum'] = state_stat['attempts_sum']
+            stat['attempts_count'] = state_stat['attempts_count']
+            stat['answers'] = json.dumps(state_stat.get('answers', {}), sort_keys=True)
+            yield stat
+
+
+def collect_course_problem_stat(course_key, since):
+    """
+    Update statistic of the course problems, that have been changed after the given time.
+    """
+    bulk_upsert(
+        ProblemStatistic,
+        get_problem_stat_rows(course_key, get_touched_problems(course_key, since)),
+        key_fields=('course_id', 'module_state_key'),
+        update_fields=(
+            'sum_grade', 'sum_max_grade', 'attempts_sum', 'attempts_count', 'submissions_count', 'answers'
+        ),
+    )
+
+
+def get_last_visit_rows(course_key, since):
+    """
+    Generate rows of the `LastVisitedSubsection` for students, that have visited the course after the given time.
+
+    The latest subsection, changed after the time, is the latest subsection of the student at all,
+    so the stored visits of the other students stay unchanged.
+    """
+    visits = StudentModule.objects.filter(course_id=course_key, module_type__exact='sequential')
+    if since is not None:
+        visits = visits.filter(modified__gt=since)
+    visits = visits.values('student_id', 'module_state_key', 'state', 'modified').order_by('student_id', 'modified')
+
+    last_visits = {}
+    for visit in visits.iterator():
+        last_visits[visit['student_id']] = visit
+
+    for student, visit in last_visits.iteritems():
+        yield {
+            'course_id': course_key,
+            'student': student,
+            'module_state_key': visit['module_state_key'],
+            'position': get_state_field(visit['state'], 'position', 1),
+            'last_visit': visit['modified'],
+        }
+
+
+def collect_course_funnel_stat(course_key, since):
+    """
+    Update last visited subsections of the students, that have visited the course after the given time.
+    """
+    bulk_upsert(
+        LastVisitedSubsection,
+        get_last_visit_rows(course_key, since),
+        key_fields=('course_id', 'student'),
+        update_fields=('module_state_key', 'position', 'last_visit'),
+    )
+
+
+def finish_course_update(course_key, since, this_update_date):
+    """
+    Update course level statistic and move the course watermark.
+
+    Statistic, that is not backfilled for the course, is collected from all student modules of the course.
+
+    :param since: previous watermark of the course or None for the first update.
+    """
+    pending = get_pending_backfills([course_key]).get(course_key, set())
+    collect_course_problem_stat(course_key, None if 'problem_stat' in pending else since)
+    collect_course_funnel_stat(course_key, None if 'funnel_stat' in pending else since)
+    for stat in pending:
+        CollectorCheckpoint.objects.update_or_create(
+            name=BACKFILL_CHECKPOINT.format(stat=stat, course=course_key),
+            defaults={'last_update': this_update_date},
+        )
+    get_watermark_storage().set(course_key, this_update_date)
+    invalidate_course_responses(course_key)
+
+
+@task
+def grade_collector_course_stat(course_string_id, users):
+    """
+    Task for update grades of the part of the course students.
+    """
+    collect_course_grade_stat(course_string_id, users)
+
+
+@task
+def grade_collector_finalize(course_string_id, since, this_update_date):
+    """
+    Task for finish the update of the course, called only when all course tasks have succeeded.
+    """
+    finish_course_update(
+        CourseKey.from_string(course_string_id),
+        since and datetime.strptime(since, DATE_TIME_FORMAT),
+        datetime.strptime(this_update_date, DATE_TIME_FORMAT),
+    )
+
 
 @periodic_task(run_every=crontab(**cron_grade_settings))
 def grade_collector_stat():
     """
     Task for update user grades.
+
+    Watermark of the course is moved only after successful update of the course,
+    so a failed course is retried from its own watermark during the next run.
+    With `RG_ANALYTICS_GRADE_STAT_FAN_OUT` enabled, each course is split into chunks of the students
+    and each chunk is processed by the separate task of the course's celery chord.
     """
     this_update_date = datetime.now()
-    users_by_course = get_items_for_grade_update()
+    users_by_course, watermarks = get_items_for_grade_update()
+
+    if GRADE_STAT_FAN_OUT:
+        for course_key, users in users_by_course.iteritems():
+            course_string_id = unicode(course_key)
+            since = watermarks.get(course_key)
+            finalize = grade_collector_finalize.si(
+                course_string_id,
+                since and since.strftime(DATE_TIME_FORMAT),
+                this_update_date.strftime(DATE_TIME_FORMAT),
+            )
+            if users:
+                chord(
+                    grade_collector_course_stat.si(course_string_id, users_chunk)
+                    for users_chunk in iter_batches(users, GRADE_STAT_USERS_CHUNK_SIZE)
+                )(finalize)
+            else:
+                finalize.delay()
+        return
+
+    for course_key, users in users_by_course.iteritems():
+        try:
+            collect_course_grade_stat(unicode(course_key), users)
+            finish_course_update(course_key, watermarks.get(course_key), this_update_date)
+        except Exception:
+            log.exception('Unable to update grade statistic of the course %s', course_key)
+
+
+def grade_events_flush():
+    """
+    Task for update grades of the students, queued by the score change events.
+
+    Queued items of the course are removed only after the course is graded, and only those,
+    that were not changed again since the claim, so score changes during the update are kept for the next flush.
+    Items of the failed course are left in the queue and moved to its end.
+    Task is scheduled only when the events are enabled.
+    """
+    claimed = timezone.now()
+    pending = list(
+        PendingGradeUpdate.objects.filter(created__lte=claimed).order_by('created', 'id')
+        .values('id', 'course_id', 'student')[:GRADE_EVENTS_BATCH_SIZE]
+    )
+
+    items_by_course = {}
+    for item in pending:
+        items_by_course.setdefault(item['course_id'], []).append(item)
 
-    collected_stat = []
-    for course_string_id, users in users_by_course.iteritems():
+    for course_key, items in items_by_course.iteritems():
+        course_items = PendingGradeUpdate.objects.filter(id__in=[item['id'] for item in items], created__lte=claimed)
         try:
-            course_key = CourseKey.from_string(course_string_id)
-            course = get_course_by_id(course_key, depth=0)
-        except (InvalidKeyError, Http404):
+            collect_course_grade_stat(unicode(course_key), [item['student'] for item in items])
+        except Exception:
+            log.exception('Unable to update grade statistic of the course %s', course_key)
+            course_items.update(created=timezone.now())
             continue
+        course_items.delete()
+        invalidate_course_responses(course_key)
 
-        with modulestore().bulk_operations(course_key):
-            for user in users:
-                grades = get_grade_summary(user, course)
-                if not grades:
-                    continue
-                exam_info = OrderedDict()
-                for grade in grades['section_breakdown']:
-                    exam_info[grade['label']] = int(grade['percent'] * 100.0)
-                exam_info['total'] = int(grades['percent'] * 100.0)
-
-                collected_stat.append(
-                    (
-                        {'course_id': course_key, 'student_id': user},
-                        {'exam_info': json.dumps(exam_info), 'total': grades['percent']}
-                    )
-                )
 
-    with transaction.atomic():
-        for key_values, additional_info in collected_stat:
-            key_values['defaults'] = additional_info
-            GradeStatistic.objects.update_or_create(**key_values)
+if GRADE_STAT_EVENTS:
+    grade_events_flush = periodic_task(run_every=crontab(**cron_grade_events_settings))(grade_events_flush)
+
+
+cron_suggestion_settings = getattr(
+    settings, 'RG_ANALYTICS_SUGGESTION_UPDATE',
+    {
+        'minute': '*/30',
+    }
+)
 
-        LastGradeStatUpdate(last_update=this_update_date).save()
+
+SUGGESTION_COURSES_CHUNK_SIZE = 100
+SUGGESTION_STATE_KEY = 'rg_analytics:suggestion_state:{course}'
+
+
+@periodic_task(run_every=crontab(**cron_suggestion_settings))
+def suggestion_collector():
+    """
+    Task for precompute suggestions of the courses.
+
+    Only courses with the collected statistic are processed. Suggestions of the course are generated only when
+    the statistic or the content of the course has been changed since the previous generation, so inactive
+    courses are skipped. Generations and versions of the courses are loaded in bulk for each chunk of the courses.
+    """
+    course_keys = GradeStatistic.objects.order_by('course_id').values_list('course_id', flat=True).distinct()
+    for course_keys_chunk in iter_batches(course_keys, SUGGESTION_COURSES_CHUNK_SIZE):
+        generations = get_generations(course_keys_chunk)
+        versions = get_course_versions(course_keys_chunk)
+        states = cache.get_many([SUGGESTION_STATE_KEY.format(course=course_key) for course_key in course_keys_chunk])
+        for course_key in course_keys_chunk:
+            state_key = SUGGESTION_STATE_KEY.format(course=course_key)
+            key = get_snapshot_key(course_key, 'suggestion', generations[course_key], versions[course_key])
+            if states.get(state_key) == key:
+                continue
+            try:
+                cache.set(key, build_course_suggestions(course_key), SNAPSHOT_TIMEOUT)
+            except Exception:
+                log.exception('Unable to generate suggestions of the course %s', course_key)
+                continue
+            cache.set(state_key, key, None)
 
 
 @task
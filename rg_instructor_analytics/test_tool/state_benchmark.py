@@ -0,0 +1,101 @@
+"""
+Micro-benchmark of the field extraction from the serialized state of the StudentModule.
+
+Compares the full `json.loads` of the state with the field projection of `utils.state`.
+The module is loaded by the file path, so the benchmark runs without edx runtime:
+
+    python rg_instructor_analytics/test_tool/state_benchmark.py [number_of_questions]
+"""
+from collections import OrderedDict
+import json
+import os
+import sys
+import timeit
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+STATE_MODULE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'utils', 'state.py')
+REPEAT = 5
+NUMBER = 2000
+
+
+def load_state_module():
+    """
+    Load `utils/state.py` without import of the package.
+    """
+    try:
+        from importlib.util import module_from_spec, spec_from_file_location
+    except ImportError:
+        import imp
+        return imp.load_source('rg_analytics_state', STATE_MODULE_PATH)
+    spec = spec_from_file_location('rg_analytics_state', STATE_MODULE_PATH)
+    module = module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def build_state(questions, fields_first):
+    """
+    Return state of the problem with the given number of the questions, similar to the capa problem state.
+
+    :param fields_first: whether the scalar fields precede the nested objects in the serialized state.
+    """
+    answers, correct_map, input_state = {}, {}, {}
+    for index in range(questions):
+        question = 'i4x-test-course-problem-{:032x}_{}_1'.format(index, index + 2)
+        answers[question] = ['choice_{}'.format(index % 4), 'choice_{}'.format((index + 1) % 4)]
+        correct_map[question] = {
+            'hint': '', 'hintmode': None, 'correctness': 'incorrect', 'msg': 'Feedback ' * 20,
+            'npoints': None, 'answervariable': None, 'queuestate': None,
+        }
+        input_state[question] = {}
+    scalars = [('last_submission_time', '2018-03-01T10:00:00Z'), ('attempts', 3), ('seed', 1), ('done', True)]
+    nested = [('correct_map', correct_map), ('input_state', input_state), ('student_answers', answers)]
+    return json.dumps(OrderedDict(scalars + nested if fields_first else nested + scalars))
+
+
+def measure_time(function):
+    """
+    Return the best time of the function call in microseconds.
+    """
+    return min(timeit.repeat(function, repeat=REPEAT, number=NUMBER)) / NUMBER * 10 ** 6
+
+
+def measure_memory(function):
+    """
+    Return peak of the allocated memory of the function call in bytes, None if tracemalloc is not available.
+    """
+    if tracemalloc is None:
+        return None
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    """
+    Run the benchmark and print the report.
+    """
+    state_module = load_state_module()
+    questions = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    for fields_first in (True, False):
+        state = build_state(questions, fields_first)
+        cases = [
+            ('json.loads', lambda: json.loads(state).get('attempts')),
+            ('projection', lambda: state_module.get_state_field(state, 'attempts')),
+        ]
+        print('State size: {} bytes, scalar fields {}'.format(len(state), 'first' if fields_first else 'last'))
+        for name, function in cases:
+            memory = measure_memory(function)
+            print('  {:<14}{:>10.1f} us{:>16}'.format(
+                name, measure_time(function), '{} B peak'.format(memory) if memory is not None else '-'
+            ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Test for the backfill of the course level statistic.
+"""
+from datetime import datetime, timedelta
+
+from django.test import TestCase
+from opaque_keys.edx.keys import CourseKey
+
+from courseware.tests.factories import StudentModuleFactory
+from openedx.core.djangoapps.content.course_overviews.tests.factories import CourseOverviewFactory
+from rg_instructor_analytics.models import LastVisitedSubsection, ProblemStatistic
+from rg_instructor_analytics.tasks import finish_course_update, get_items_for_grade_update, get_pending_backfills
+from rg_instructor_analytics.utils.watermark import get_watermark_storage
+
+
+class TestBackfill(TestCase):
+    """
+    Test for the backfill of the course, collected before the statistic was introduced.
+    """
+
+    COURSE_KEY = CourseKey.from_string('course-v1:test+course+id')
+
+    def test_backfill(self):
+        """
+        Verify that untouched problems and visits are collected once, and the course is not backfilled again.
+        """
+        problem = self.COURSE_KEY.make_usage_key('problem', 'untouched')
+        module = StudentModuleFactory(
+            course_id=self.COURSE_KEY, module_state_key=problem, module_type='problem',
+            grade=1, max_grade=2, state='{"attempts": 1}',
+        )
+        subsection = self.COURSE_KEY.make_usage_key('sequential', 'visited')
+        StudentModuleFactory(
+            course_id=self.COURSE_KEY, module_state_key=subsection, module_type='sequential',
+            student=module.student, state='{"position": 2}',
+        )
+        watermark = datetime.now() + timedelta(days=1)
+        self.assertEqual(
+            get_pending_backfills([self.COURSE_KEY]), {self.COURSE_KEY: {'problem_stat', 'funnel_stat'}}
+        )
+
+        finish_course_update(self.COURSE_KEY, watermark, watermark)
+        stat = ProblemStatistic.objects.get(course_id=self.COURSE_KEY, module_state_key=problem)
+        self.assertEqual((stat.sum_grade, stat.sum_max_grade, stat.attempts_sum), (1, 2, 1))
+        visit = LastVisitedSubsection.objects.get(course_id=self.COURSE_KEY, student=module.student)
+        self.assertEqual((visit.module_state_key, visit.position), (subsection, 2))
+        self.assertEqual(get_pending_backfills([self.COURSE_KEY]), {})
+
+    def test_course_without_enrollments(self):
+        """
+        Verify that a new course without the enrollments is updated once and gets its watermark.
+        """
+        course_key = CourseOverviewFactory().id
+        users_by_course, watermarks = get_items_for_grade_update()
+        self.assertEqual(users_by_course, {course_key: []})
+        self.assertEqual(watermarks, {})
+
+        this_update_date = datetime.now()
+        finish_course_update(course_key, None, this_update_date)
+        self.assertEqual(get_watermark_storage().get_many([course_key]), {course_key: this_update_date})
+        self.assertEqual(get_items_for_grade_update(), ({}, {course_key: this_update_date}))
@@ -0,0 +1,95 @@
+"""
+Test for the batch api.
+"""
+from datetime import datetime
+import json
+
+from django.http.response import JsonResponse
+from django.test import RequestFactory, TestCase
+from mock import Mock, patch
+
+from rg_instructor_analytics.views.Batch import BATCH_WIDGETS, BatchView, build_widget_request
+
+
+class TestBatch(TestCase):
+    """
+    Test for the batch api.
+    """
+
+    def test_widget_request(self):
+        """
+        Verify that widget parameters replace parameters of the batch request.
+        """
+        request = RequestFactory().post('/api/batch/', {'requests': '[]', 'course_id': 'course-v1:test+course+id'})
+        widget_request = build_widget_request(request, 'course-v1:test+course+id', {'fields': ['a', 'b'], 'limit': 10})
+
+        self.assertEqual(widget_request.POST.getlist('fields'), ['a', 'b'])
+        self.assertEqual(widget_request.POST['limit'], '10')
+        self.assertEqual(widget_request.POST['course_id'], 'course-v1:test+course+id')
+        self.assertNotIn('requests', widget_request.POST)
+
+    def test_malformed_batch(self):
+        """
+        Verify that unknown widgets and malformed requests are rejected.
+        """
+        for requests in ('{}', '[{"widget": "cohort/send_email"}]', '[{"widget": "cohort", "params": []}]', '[1]'):
+            request = RequestFactory().post('/api/batch/', {'requests': requests})
+            self.assertEqual(BatchView().process(request, course_id='course-v1:test+course+id').status_code, 400)
+        self.assertEqual(json.loads(BatchView().process(
+            RequestFactory().post('/api/batch/', {'requests': '[]'}), course_id='course-v1:test+course+id'
+        ).content), {'results': []})
+
+    def test_concurrent_batch(self):
+        """
+        Verify that widgets are processed by the pool of threads without the shared course descriptor.
+        """
+        overview = Mock(enrollment_start=None, start=datetime(2018, 1, 1), enrollment_end=None, end=None)
+        request = RequestFactory().post(
+            '/api/batch/', {'requests': json.dumps([{'widget': 'course_info'}, {'widget': 'course_info'}])}
+        )
+        with patch('rg_instructor_analytics.views.Batch.BATCH_CONCURRENCY', 2):
+            with patch('rg_instructor_analytics.views.TabFragment.CourseOverview') as course_overview:
+                course_overview.get_from_id.return_value = overview
+                response = BatchView().process(
+                    request, course_id='course-v1:test+course+id', course_key='course-v1:test+course+id', course=None
+                )
+
+        self.assertEqual(course_overview.get_from_id.call_count, 2)
+        results = json.loads(response.content)['results']
+        self.assertEqual([result['status'] for result in results], [200, 200])
+        self.assertEqual([result['data']['course_id'] for result in results], ['course-v1:test+course+id'] * 2)
+
+    def test_dashboard_batch(self):
+        """
+        Verify that the batch of the tabs, sent by the dashboard on the course selection, reaches each widget.
+        """
+        # Requests of the tabs, collected by `TabHolder.loadTabs`.
+        tab_requests = [
+            {'widget': 'course_info', 'params': {}},
+            {'widget': 'problem_statics/homework', 'params': {}},
+            {'widget': 'gradebook', 'params': {'filter': '', 'sort': 'username', 'order': 'asc'}},
+            {'widget': 'cohort', 'params': {}},
+            {'widget': 'funnel', 'params': {}},
+            {'widget': 'suggestion', 'params': {'intent': 'get_norm_list'}},
+        ]
+        request = RequestFactory().post('/api/batch/', {'requests': json.dumps(tab_requests)})
+        patches = [
+            patch.object(
+                BATCH_WIDGETS[tab_request['widget']], 'process',
+                side_effect=lambda widget_request, **kwargs: JsonResponse(widget_request.POST.dict()),
+            )
+            for tab_request in tab_requests
+        ]
+        for view_patch in patches:
+            view_patch.start()
+            self.addCleanup(view_patch.stop)
+        response = BatchView().process(
+            request, course_id='course-v1:test+course+id', course_key='course-v1:test+course+id', course=None
+        )
+
+        results = json.loads(response.content)['results']
+        self.assertEqual([result['status'] for result in results], [200] * len(tab_requests))
+        self.assertEqual(
+            [result['data'] for result in results],
+            [dict(tab_request['params'], course_id='course-v1:test+course+id') for tab_request in tab_requests],
+        )
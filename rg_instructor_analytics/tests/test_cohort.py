@@ -0,0 +1,113 @@
+"""
+Test for the cohorts of the students.
+"""
+import json
+
+from django.core import mail
+from django.test import TestCase
+from mock import Mock, patch
+from opaque_keys.edx.keys import CourseKey
+
+from rg_instructor_analytics.models import CohortEmail, CohortEmailBatch, GradeStatistic
+from rg_instructor_analytics.tasks import send_cohort_email_batch
+from rg_instructor_analytics.utils.cohort import (
+    get_cohort_counts, get_grade_summary, get_thresholds, parse_thresholds
+)
+from student.tests.factories import UserFactory
+
+
+class TestCohort(TestCase):
+    """
+    Test for the cohorts of the students.
+    """
+
+    def test_thresholds(self):
+        """
+        Verify that thresholds out of [0; 1] and too close thresholds are skipped.
+        """
+        self.assertEqual(get_thresholds(0.5, 0.125), [0.0, 0.125, 0.4375, 0.5625, 0.875, 1.0])
+        self.assertEqual(get_thresholds(0.0, 0.0), [0.0, 1.0])
+
+    def test_cohort_counts(self):
+        """
+        Verify that zero grades form the first cohort and the max grade belongs to the last cohort.
+        """
+        course_key = CourseKey.from_string('course-v1:test+course+id')
+        grades = [0.0, 0.0, 0.2, 0.45, 0.5, 0.54, 0.55, 0.9, 1.0]
+        for grade in grades:
+            GradeStatistic.objects.create(course_id=course_key, student=UserFactory(), exam_info='{}', total=grade)
+        students = GradeStatistic.objects.filter(course_id=course_key)
+
+        count, mean, std = get_grade_summary(students)
+        self.assertEqual(count, len(grades))
+        self.assertAlmostEqual(mean, sum(grades) / len(grades))
+        self.assertGreater(std, 0.0)
+
+        thresholds = get_thresholds(mean, std)
+        counts = get_cohort_counts(students, thresholds)
+        self.assertEqual(sum(counts), len(grades))
+        self.assertEqual(counts[0], 2)
+        self.assertEqual(counts[-1], len([grade for grade in grades if grade >= thresholds[-2]]))
+        self.assertEqual(get_grade_summary(students.none()), (0, 0.0, 0.0))
+
+    def test_parse_thresholds(self):
+        """
+        Verify that only sorted list of numbers is accepted.
+        """
+        self.assertEqual(parse_thresholds('[0, 0.5, 1]'), [0.0, 0.5, 1.0])
+        for value in ('', '{}', '[]', '[0, "a"]', '[1, 0]'):
+            with self.assertRaises(ValueError):
+                parse_thresholds(value)
+
+    def test_email_batch(self):
+        """
+        Verify that each recipient receives a separate message, and delivered recipients are skipped on retry.
+        """
+        email = CohortEmail.objects.create(
+            course_id=CourseKey.from_string('course-v1:test+course+id'), subject='Subject',
+            from_address='course@example.com', text_content='Text', html_content='<p>Text</p>',
+        )
+        batch = CohortEmailBatch.objects.create(
+            email=email, recipients=json.dumps(['a@example.com', 'b@example.com', 'c@example.com']), sent_count=1
+        )
+        send_cohort_email_batch(batch.id)
+        send_cohort_email_batch(batch.id)
+
+        self.assertEqual([message.to for message in mail.outbox], [['b@example.com'], ['c@example.com']])
+        batch.refresh_from_db()
+        self.assertEqual((batch.sent_count, batch.attempts), (3, 1))
+        self.assertIsNotNone(batch.finished)
+
+    def test_email_batch_failure(self):
+        """
+        Verify that delivered recipients are stored after each message, and the batch is failed after the retries.
+        """
+        email = CohortEmail.objects.create(
+            course_id=CourseKey.from_string('course-v1:test+course+id'), subject='Subject',
+            from_address='course@example.com', text_content='Text', html_content='<p>Text</p>',
+        )
+        batch = CohortEmailBatch.objects.create(
+            email=email, recipients=json.dumps(['a@example.com', 'b@example.com', 'c@example.com'])
+        )
+        connection = Mock()
+        # Worker is killed during delivery of the second message.
+        connection.send_messages.side_effect = [None, SystemExit]
+        with patch('rg_instructor_analytics.tasks.get_connection', return_value=connection):
+            with self.assertRaises(SystemExit):
+                send_cohort_email_batch(batch.id)
+        batch.refresh_from_db()
+        self.assertEqual((batch.sent_count, batch.attempts), (1, 1))
+
+        connection.send_messages.side_effect = IOError
+        with patch('rg_instructor_analytics.tasks.get_connection', return_value=connection):
+            with patch.object(send_cohort_email_batch, 'max_retries', 0):
+                with self.assertRaises(IOError):
+                    send_cohort_email_batch(batch.id)
+        batch.refresh_from_db()
+        self.assertEqual((batch.sent_count, batch.attempts), (1, 2))
+        self.assertIsNotNone(batch.failed)
+        self.assertIsNone(batch.finished)
+
+        send_cohort_email_batch(batch.id)
+        batch.refresh_from_db()
+        self.assertEqual(batch.attempts, 2)
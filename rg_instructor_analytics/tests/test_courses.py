@@ -0,0 +1,94 @@
+"""
+Test for the list of the courses, available for the user.
+"""
+import json
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+
+from openedx.core.djangoapps.content.course_overviews.tests.factories import CourseOverviewFactory
+from rg_instructor_analytics.utils.courses import build_course_list, get_available_courses
+from rg_instructor_analytics.views.TabFragment import CourseListView
+from student.models import CourseAccessRole
+from student.tests.factories import UserFactory
+
+
+class TestCourseList(TestCase):
+    """
+    Test for the list of the courses, available for the user.
+    """
+
+    def setUp(self):
+        """
+        Implement from base class.
+        """
+        cache.clear()
+        self.courses = [
+            CourseOverviewFactory(display_name='B course'),
+            CourseOverviewFactory(display_name='A course'),
+            CourseOverviewFactory(display_name='C course'),
+        ]
+        self.staff = UserFactory(is_staff=True)
+        self.instructor = UserFactory()
+        CourseAccessRole.objects.create(user=self.instructor, course_id=self.courses[0].id, role='instructor')
+        CourseAccessRole.objects.create(user=self.instructor, course_id=self.courses[1].id, role='beta_testers')
+
+    def test_build_course_list(self):
+        """
+        Verify that staff has all courses ordered by name, and other users have the courses of their roles only.
+        """
+        self.assertEqual(
+            [course['course_name'] for course in build_course_list(self.staff)], ['A course', 'B course', 'C course']
+        )
+        self.assertEqual(
+            build_course_list(self.instructor),
+            [{'course_id': unicode(self.courses[0].id), 'course_name': u'B course'}],
+        )
+
+        overview = self.courses[2]
+        overview.display_name = None
+        overview.save()
+        self.assertIn(
+            {'course_id': unicode(overview.id), 'course_name': unicode(overview.id)}, build_course_list(self.staff)
+        )
+
+    def test_invalidation(self):
+        """
+        Verify that cached list is dropped, when the courses, the roles or the staff flag of the user are changed.
+        """
+        self.assertEqual(len(get_available_courses(self.staff)), 3)
+        CourseOverviewFactory(display_name='D course')
+        self.assertEqual(len(get_available_courses(self.staff)), 4)
+
+        self.assertEqual(len(get_available_courses(self.instructor)), 1)
+        CourseAccessRole.objects.create(user=self.instructor, course_id=self.courses[2].id, role='staff')
+        self.assertEqual(len(get_available_courses(self.instructor)), 2)
+
+        instructor = User.objects.get(id=self.instructor.id)
+        instructor.is_staff = True
+        instructor.save()
+        self.assertEqual(len(get_available_courses(instructor)), 4)
+
+    def get_page(self, params):
+        """
+        Return response of the course list api for the staff user.
+        """
+        request = RequestFactory().post('/api/courses/', params)
+        request.user = self.staff
+        return CourseListView().process(request)
+
+    def test_course_list_view(self):
+        """
+        Verify that courses are paged by the offset, and malformed paging is rejected.
+        """
+        response = json.loads(self.get_page({'limit': 2}).content)
+        self.assertEqual([course['course_name'] for course in response['courses']], ['A course', 'B course'])
+        self.assertEqual(response['next_offset'], 2)
+
+        response = json.loads(self.get_page({'offset': 2, 'limit': 2}).content)
+        self.assertEqual([course['course_name'] for course in response['courses']], ['C course'])
+        self.assertIsNone(response['next_offset'])
+
+        for params in ({'offset': 'x'}, {'limit': ''}):
+            self.assertEqual(self.get_page(params).status_code, 400)
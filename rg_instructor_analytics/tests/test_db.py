@@ -0,0 +1,90 @@
+"""
+Test for the database helpers.
+"""
+from django.contrib.auth.models import User
+from django.test import TestCase
+from opaque_keys.edx.keys import CourseKey
+
+from rg_instructor_analytics.models import GradeStatistic
+from rg_instructor_analytics.utils.db import bulk_upsert, iter_batches, QueryCounter
+from student.tests.factories import UserFactory
+
+
+class TestBulkUpsert(TestCase):
+    """
+    Test for the bulk upsert of the collected statistic.
+    """
+
+    COURSE_KEY = CourseKey.from_string('course-v1:test+course+id')
+
+    def setUp(self):
+        """
+        Implement from base class.
+        """
+        self.users = [UserFactory() for _ in range(3)]
+
+    def rows(self, total):
+        """
+        Return grade statistic rows for all test users.
+        """
+        return [
+            {'course_id': self.COURSE_KEY, 'student_id': user.id, 'exam_info': '{}', 'total': total}
+            for user in self.users
+        ]
+
+    def upsert(self, rows):
+        """
+        Run upsert of the grade statistic.
+        """
+        return bulk_upsert(
+            GradeStatistic, rows, key_fields=('course_id', 'student_id'), update_fields=('exam_info', 'total'),
+            batch_size=2,
+        )
+
+    def test_iter_batches(self):
+        """
+        Verify splitting into batches.
+        """
+        self.assertEqual(list(iter_batches(range(5), 2)), [[0, 1], [2, 3], [4]])
+        self.assertEqual(list(iter_batches([], 2)), [])
+
+    def test_insert_and_update(self):
+        """
+        Verify that new rows are inserted and only changed rows are updated.
+        """
+        self.assertEqual(self.upsert(self.rows(0.5)), 3)
+        self.assertEqual(self.upsert(self.rows(0.5)), 0)
+
+        rows = self.rows(0.5)
+        rows[0]['total'] = 1.0
+        self.assertEqual(self.upsert(rows), 1)
+
+        self.assertEqual(GradeStatistic.objects.count(), 3)
+        self.assertEqual(GradeStatistic.objects.get(student=self.users[0]).total, 1.0)
+
+
+class TestQueryCounter(TestCase):
+    """
+    Test for the query counter.
+    """
+
+    def test_count(self):
+        """
+        Verify counting of the queries per call.
+        """
+        counter = QueryCounter()
+        with counter.count():
+            User.objects.count()
+        with counter.count():
+            User.objects.count()
+            User.objects.count()
+        self.assertEqual((counter.calls, counter.queries, counter.per_call), (2, 3, 1.5))
+
+    def test_disabled_count(self):
+        """
+        Verify that disabled counter does not count queries.
+        """
+        counter = QueryCounter(enabled=False)
+        with counter.count():
+            User.objects.count()
+        self.assertEqual((counter.calls, counter.queries, counter.per_call), (0, 0, 0.0))
@@ -0,0 +1,43 @@
+"""
+Test for the event-driven grade statistic update.
+"""
+from django.test import TestCase
+from mock import patch
+from opaque_keys.edx.keys import CourseKey
+
+from rg_instructor_analytics.models import PendingGradeUpdate
+from rg_instructor_analytics.signals import enqueue_grade_update
+from rg_instructor_analytics.tasks import grade_events_flush
+
+
+class TestGradeEvents(TestCase):
+    """
+    Test for the queue of the grade statistic updates.
+    """
+
+    COURSE_KEY = CourseKey.from_string('course-v1:test+course+id')
+    FAILED_COURSE_KEY = CourseKey.from_string('course-v1:test+failed+id')
+
+    def test_flush(self):
+        """
+        Verify that items are kept for the failed course and for the score changed during the update.
+        """
+        enqueue_grade_update(self.COURSE_KEY, 1)
+        enqueue_grade_update(self.COURSE_KEY, 2)
+        enqueue_grade_update(self.FAILED_COURSE_KEY, 3)
+        enqueue_grade_update(self.COURSE_KEY, 1)
+        self.assertEqual(PendingGradeUpdate.objects.count(), 3)
+
+        def collect_course_grade_stat(course_string_id, users):
+            if course_string_id == unicode(self.FAILED_COURSE_KEY):
+                raise ValueError
+            self.assertEqual(sorted(users), [1, 2])
+            enqueue_grade_update(self.COURSE_KEY, 1)
+
+        with patch('rg_instructor_analytics.tasks.collect_course_grade_stat', collect_course_grade_stat):
+            grade_events_flush()
+
+        self.assertEqual(
+            sorted(PendingGradeUpdate.objects.values_list('course_id', 'student')),
+            sorted([(self.COURSE_KEY, 1), (self.FAILED_COURSE_KEY, 3)]),
+        )
@@ -0,0 +1,64 @@
+"""
+Test for the gradebook api.
+"""
+from collections import OrderedDict
+import json
+
+from django.test import TestCase
+from opaque_keys.edx.keys import CourseKey
+
+from rg_instructor_analytics.models import GradeStatistic, GradeStatisticItem
+from rg_instructor_analytics.tasks import collect_course_grade_items
+from rg_instructor_analytics.views.Gradebook import decode_cursor, encode_cursor, GradebookView
+from student.tests.factories import UserFactory
+
+
+class TestGradebookCursor(TestCase):
+    """
+    Test for the cursor of the gradebook pages.
+    """
+
+    def test_cursor(self):
+        """
+        Verify that the cursor keeps sort value and student, and malformed cursor is rejected.
+        """
+        self.assertEqual(decode_cursor(encode_cursor(u'student', 10)), (u'student', 10))
+        self.assertEqual(decode_cursor(encode_cursor(0.75, 3)), (0.75, 3))
+        for cursor in ('not a cursor', encode_cursor(None, None)[:-2], 'WzFd'):
+            with self.assertRaises(ValueError):
+                decode_cursor(cursor)
+
+
+class TestGradeItems(TestCase):
+    """
+    Test for the per-assignment grades.
+    """
+
+    COURSE_KEY = CourseKey.from_string('course-v1:test+course+id')
+
+    def set_grades(self, user, grades):
+        """
+        Store grade statistic of the user with the given exam grades.
+        """
+        GradeStatistic.objects.update_or_create(
+            course_id=self.COURSE_KEY, student=user,
+            defaults={'exam_info': json.dumps(OrderedDict(grades)), 'total': grades[-1][1] / 100.0},
+        )
+
+    def test_collect_grade_items(self):
+        """
+        Verify that items follow the exam info, and grades of the removed assignments are deleted.
+        """
+        users = [UserFactory(), UserFactory()]
+        self.set_grades(users[0], [('HW 01', 50), ('HW 02', 70), ('total', 60)])
+        self.set_grades(users[1], [('HW 01', 90), ('HW 02', 10), ('total', 50)])
+        collect_course_grade_items(self.COURSE_KEY, [user.id for user in users])
+        self.assertEqual(GradebookView.get_exam_names(self.COURSE_KEY), ['HW 01', 'HW 02', 'total'])
+
+        self.set_grades(users[0], [('HW 01', 80), ('total', 80)])
+        collect_course_grade_items(self.COURSE_KEY, [users[0].id])
+        self.assertEqual(
+            GradebookView.get_grades(self.COURSE_KEY, [users[0].id], ['HW 01', 'HW 02', 'total']),
+            {users[0].id: {'HW 01': 80, 'total': 80}}
+        )
+        self.assertEqual(GradeStatisticItem.objects.filter(student=users[1].id).count(), 3)
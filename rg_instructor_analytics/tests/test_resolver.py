@@ -0,0 +1,80 @@
+"""
+Test for the memoization of the course and access resolution.
+"""
+from threading import Thread
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from mock import Mock, patch
+from opaque_keys.edx.keys import CourseKey
+
+from rg_instructor_analytics.utils.resolver import get_course, TTLCache, user_has_access
+from student.models import CourseAccessRole
+from student.tests.factories import UserFactory
+
+
+class TestTTLCache(TestCase):
+    """
+    Test for the in-process cache with the limited lifetime.
+    """
+
+    def test_get_or_set(self):
+        """
+        Verify that values are computed once, expired and the oldest values are recomputed.
+        """
+        compute = Mock(side_effect=lambda: compute.call_count)
+        cache = TTLCache(timeout=60, max_items=2)
+        self.assertEqual(cache.get_or_set('a', compute), 1)
+        self.assertEqual(cache.get_or_set('a', compute), 1)
+
+        cache.get_or_set('b', compute)
+        cache.get_or_set('c', compute)
+        self.assertEqual(cache.get_or_set('a', compute), 4)
+
+        expired = TTLCache(timeout=-1)
+        expired.get_or_set('a', compute)
+        self.assertEqual(expired.get_or_set('a', compute), 6)
+
+
+class TestResolver(TestCase):
+    """
+    Test for the memoized course and access resolution.
+    """
+
+    def test_course_per_thread(self):
+        """
+        Verify that the course descriptor is memoized in the thread and is not shared with the other threads.
+        """
+        courses = []
+        with patch('rg_instructor_analytics.utils.resolver.get_course_by_id', side_effect=lambda *args, **kw: Mock()):
+            courses.extend([get_course('course-v1:test+thread+id'), get_course('course-v1:test+thread+id')])
+            thread = Thread(target=lambda: courses.append(get_course('course-v1:test+thread+id')))
+            thread.start()
+            thread.join()
+        self.assertIs(courses[0], courses[1])
+        self.assertIsNot(courses[0], courses[2])
+
+    def test_access_invalidation(self):
+        """
+        Verify that access decisions are dropped, when the flags or the org-wide role of the user are changed.
+        """
+        course = Mock(id=CourseKey.from_string('course-v1:test+access+id'))
+        user = User.objects.get(id=UserFactory(is_staff=True).id)
+        with patch('rg_instructor_analytics.utils.resolver.has_access', return_value=True) as has_access:
+            user_has_access(user, 'staff', course)
+            user_has_access(user, 'staff', course)
+            self.assertEqual(has_access.call_count, 1)
+
+            user.last_login = user.date_joined
+            user.save()
+            user_has_access(user, 'staff', course)
+            self.assertEqual(has_access.call_count, 1)
+
+            user.is_staff = False
+            user.save()
+            user_has_access(user, 'staff', course)
+            self.assertEqual(has_access.call_count, 2)
+
+            CourseAccessRole.objects.create(user=user, org='test', role='staff')
+            user_has_access(user, 'staff', course)
+            self.assertEqual(has_access.call_count, 3)
@@ -0,0 +1,83 @@
+"""
+Test for the cache of the api responses.
+"""
+from django.core.cache import cache
+from django.http.request import QueryDict
+from django.http.response import JsonResponse
+from django.test import RequestFactory, TestCase
+from mock import Mock
+
+from rg_instructor_analytics.utils.response_cache import (
+    cached_response, get_generation, get_generations, invalidate_course_responses, response_cache_key
+)
+
+
+class CachedView(object):
+    """
+    View with the cached responses.
+    """
+
+    cache_timeout = 60
+
+
+class TestResponseCache(TestCase):
+    """
+    Test for the cache of the api responses.
+    """
+
+    COURSE_ID = 'course-v1:test+course+id'
+
+    def setUp(self):
+        """
+        Implement from base class.
+        """
+        cache.clear()
+        self.request = RequestFactory().post('/api/', {'filter': 'abc'})
+
+    def test_key_normalization(self):
+        """
+        Verify that key does not depend on the ignored parameters and parameters order, but depends on values order.
+        """
+        key = response_cache_key('View', self.COURSE_ID, QueryDict('b=1&a=2&a=3'))
+        self.assertEqual(key, response_cache_key('View', self.COURSE_ID, QueryDict('a=2&a=3&b=1&course_id=x')))
+        self.assertNotEqual(key, response_cache_key('View', self.COURSE_ID, QueryDict('a=3&a=2&b=1')))
+        self.assertNotEqual(key, response_cache_key('OtherView', self.COURSE_ID, QueryDict('b=1&a=2&a=3')))
+
+    def test_cached_response(self):
+        """
+        Verify that response is computed once until the course responses are invalidated.
+        """
+        process = Mock(return_value=JsonResponse({'value': 1}))
+
+        first = cached_response(CachedView(), self.request, self.COURSE_ID, process)
+        second = cached_response(CachedView(), self.request, self.COURSE_ID, process)
+        self.assertEqual(process.call_count, 1)
+        self.assertEqual(first.content, second.content)
+
+        invalidate_course_responses(self.COURSE_ID)
+        cached_response(CachedView(), self.request, self.COURSE_ID, process)
+        self.assertEqual(process.call_count, 2)
+
+    def test_not_cached_view(self):
+        """
+        Verify that responses of the view without timeout are not cached.
+        """
+        view = CachedView()
+        view.cache_timeout = None
+        process = Mock(return_value=JsonResponse({'value': 1}))
+
+        cached_response(view, self.request, self.COURSE_ID, process)
+        cached_response(view, self.request, self.COURSE_ID, process)
+        self.assertEqual(process.call_count, 2)
+
+    def test_generations(self):
+        """
+        Verify that bulk generations are equal to the generations of the courses, and missing ones are created.
+        """
+        other_course_id = 'course-v1:test+other+id'
+        generation = get_generation(self.COURSE_ID)
+        generations = get_generations([self.COURSE_ID, other_course_id])
+        self.assertEqual(generations, {self.COURSE_ID: generation, other_course_id: get_generation(other_course_id)})
+
+        invalidate_course_responses(self.COURSE_ID)
+        self.assertNotEqual(get_generations([self.COURSE_ID])[self.COURSE_ID], generation)
@@ -0,0 +1,78 @@
+"""
+Test for the search of the students in the gradebook.
+"""
+from datetime import datetime
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from opaque_keys.edx.keys import CourseKey
+
+from rg_instructor_analytics.models import GradeStatistic, GradeStatisticTrigram
+from rg_instructor_analytics.utils.search import get_search_text, search_students, update_search_index
+from student.tests.factories import UserFactory
+
+
+class TestSearch(TestCase):
+    """
+    Test for the search of the students in the gradebook.
+    """
+
+    COURSE_KEY = CourseKey.from_string('course-v1:test+course+id')
+
+    def setUp(self):
+        """
+        Implement from base class.
+        """
+        self.users = [
+            UserFactory(username='jsmith', first_name='John', last_name='Smith', email='john@example.com'),
+            UserFactory(username='ajones', first_name='Anna', last_name='Jones', email='anna@example.com'),
+        ]
+        for user in self.users:
+            GradeStatistic.objects.create(
+                course_id=self.COURSE_KEY, student=user, exam_info='{}', total=0, search_text=get_search_text(user)
+            )
+        update_search_index(self.COURSE_KEY, [user.id for user in self.users])
+
+    def search(self, query):
+        """
+        Return usernames of the students, found by the query.
+        """
+        students = search_students(GradeStatistic.objects.filter(course_id=self.COURSE_KEY), self.COURSE_KEY, query)
+        return sorted(students.values_list('student__username', flat=True))
+
+    def test_search(self):
+        """
+        Verify that students are found by any part of the username, names and email, regardless of the case.
+        """
+        self.assertEqual(self.search('SMITH'), ['jsmith'])
+        self.assertEqual(self.search('example'), ['ajones', 'jsmith'])
+        self.assertEqual(self.search('an'), ['ajones'])
+        self.assertEqual(self.search('nna smi'), [])
+
+    def test_index_update(self):
+        """
+        Verify that only changed students are reindexed.
+        """
+        user = self.users[0]
+        GradeStatistic.objects.filter(student=user).update(search_text='jdoe john doe john@example.com')
+        with self.assertNumQueries(2):
+            update_search_index(self.COURSE_KEY, [self.users[1].id])
+        update_search_index(self.COURSE_KEY, [user.id])
+
+        self.assertEqual(self.search('doe'), ['jsmith'])
+        self.assertEqual(self.search('smith'), [])
+        self.assertFalse(GradeStatisticTrigram.objects.filter(student=user.id, trigram='smi').exists())
+
+    def test_user_changed(self):
+        """
+        Verify that saves of the user without changes of the search fields do not query the grade statistic.
+        """
+        user = User.objects.get(id=self.users[0].id)
+        user.date_joined = datetime(2018, 1, 1)
+        with self.assertNumQueries(1):
+            user.save()
+
+        user.last_name = 'Doe'
+        user.save()
+        self.assertEqual(self.search('doe'), ['jsmith'])
+        self.assertEqual(self.search('smith'), [])
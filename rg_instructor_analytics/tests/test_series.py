@@ -0,0 +1,135 @@
+"""
+Test for the dense day-indexed series.
+"""
+from datetime import date, datetime, time, timedelta
+from importlib import import_module
+from time import mktime
+
+from django.apps import apps
+from django.test import TestCase
+from opaque_keys.edx.keys import CourseKey
+
+from rg_instructor_analytics.models import EnrollmentSeries, EnrollmentTabCache
+from rg_instructor_analytics.tasks import collect_enrollment_history_chunk
+from rg_instructor_analytics.utils.series import DaySeries, get_period_starts, PERIODS
+from rg_instructor_analytics.views.Enrollment import EnrollmentStatisticView
+
+
+class TestDaySeries(TestCase):
+    """
+    Test for the dense day-indexed series.
+    """
+
+    def test_cumulative(self):
+        """
+        Verify that counts are cumulative, zero before the start and kept after the last day.
+        """
+        series = DaySeries()
+        series.add({date(2018, 5, 3): 2, date(2018, 5, 5): 1})
+        series = DaySeries.unpack(series.start, series.pack())
+        series.add({date(2018, 5, 1): 1})
+
+        self.assertEqual(series.cumulative(date(2018, 4, 30), date(2018, 5, 7)), [0, 1, 1, 3, 3, 4, 4, 4])
+        self.assertEqual(series.at(date(2019, 1, 1)), 4)
+
+    def test_periods(self):
+        """
+        Verify that the next periods start on Monday or on the first day of the month.
+        """
+        self.assertEqual(
+            get_period_starts(date(2018, 5, 3), date(2018, 5, 15), 'week'),
+            [date(2018, 5, 3), date(2018, 5, 7), date(2018, 5, 14)]
+        )
+        self.assertEqual(
+            get_period_starts(date(2018, 11, 20), date(2019, 1, 1), 'month'),
+            [date(2018, 11, 20), date(2018, 12, 1), date(2019, 1, 1)]
+        )
+        series = DaySeries()
+        series.add({date(2018, 5, 3): 2, date(2018, 5, 8): 1, date(2018, 5, 20): 5})
+        starts = get_period_starts(date(2018, 5, 3), date(2018, 5, 15), 'week')
+        self.assertEqual(series.get_period_counts(starts, date(2018, 5, 15)), [0, 2, 3, 3])
+        with self.assertRaises(ValueError):
+            get_period_starts(date(2018, 5, 3), date(2018, 5, 15), 'year')
+
+
+class TestEnrollmentSeries(TestCase):
+    """
+    Test for the enrollment series, written by the collector and by the migration.
+    """
+
+    COURSE_KEY = CourseKey.from_string('course-v1:test+course+id')
+    # Enrollment history as `(day, user, is_active)`.
+    HISTORY = [
+        (date(2018, 1, 3), 1, True),
+        (date(2018, 1, 3), 2, True),
+        (date(2018, 1, 5), 3, True),
+        (date(2018, 1, 5), 1, False),
+        (date(2018, 1, 20), 1, True),
+        (date(2018, 2, 10), 2, False),
+    ]
+
+    def collect(self, first, last):
+        """
+        Run the given items of the history through the collector as one chunk.
+        """
+        collect_enrollment_history_chunk([
+            {
+                'history_id': index, 'history_date': datetime.combine(day, time(12)), 'is_active': is_active,
+                'user': user, 'course_id': unicode(self.COURSE_KEY),
+            }
+            for index, (day, user, is_active) in enumerate(self.HISTORY[first:last], first + 1)
+        ])
+
+    def get_expected_statistic(self, from_day, to_day, period):
+        """
+        Return statistic of the range, computed from the enrollment tab cache.
+        """
+        stats = list(EnrollmentTabCache.objects.filter(course_id=self.COURSE_KEY).order_by('created'))
+        starts = get_period_starts(from_day, to_day, period)
+        ranges = zip(starts, [day - timedelta(1) for day in starts[1:]] + [to_day])
+
+        def get_total(day):
+            totals = [stat.total for stat in stats if stat.created <= day]
+            return totals[-1] if totals else 0
+
+        def get_sum(field, start, end):
+            return sum(getattr(stat, field) for stat in stats if start <= stat.created <= end)
+
+        return {
+            'dates_total': starts,
+            'counts_total': [get_total(end) for _, end in ranges],
+            'counts_enroll': [get_sum('enroll', start, end) for start, end in ranges],
+            'counts_unenroll': [get_sum('unenroll', start, end) for start, end in ranges],
+        }
+
+    def assert_statistic(self, from_day, to_day):
+        """
+        Verify that the statistic of the series is equal to the statistic of the tab cache for all periods.
+        """
+        for period in PERIODS:
+            statistic = EnrollmentStatisticView.get_statistic_per_day(
+                mktime(from_day.timetuple()), mktime(to_day.timetuple()), self.COURSE_KEY, period
+            )
+            expected = self.get_expected_statistic(from_day, to_day, period)
+            self.assertEqual({name: statistic[name] for name in expected}, expected)
+
+    def test_enrollment_series(self):
+        """
+        Verify that the series of the collector and of the migration give the totals of the tab cache.
+        """
+        self.collect(0, 3)
+        self.collect(3, len(self.HISTORY))
+        self.assertEqual(
+            EnrollmentStatisticView.get_statistic_per_day(
+                mktime(date(2017, 12, 1).timetuple()), mktime(date(2018, 3, 15).timetuple()), self.COURSE_KEY, 'month'
+            )['counts_total'],
+            [0, 3, 2, 2],
+        )
+        # Ranges start before the first day of the series and inside of the series.
+        self.assert_statistic(date(2017, 12, 1), date(2018, 3, 15))
+        self.assert_statistic(date(2018, 1, 4), date(2018, 1, 25))
+
+        EnrollmentSeries.objects.all().delete()
+        import_module('rg_instructor_analytics.migrations.0014_enrollmentseries').build_enrollment_series(apps, None)
+        self.assert_statistic(date(2017, 12, 1), date(2018, 3, 15))
+        self.assert_statistic(date(2018, 1, 4), date(2018, 1, 25))
@@ -0,0 +1,36 @@
+"""
+Test for the extraction of the fields from the serialized state.
+"""
+import json
+from unittest import TestCase
+
+from rg_instructor_analytics.utils.state import get_state_field, get_state_fields
+
+
+class TestStateFields(TestCase):
+    """
+    Test for the extraction of the fields from the serialized state.
+    """
+
+    def test_top_level_fields(self):
+        """
+        Verify that only top level keys are extracted, nested keys with the same name are skipped.
+        """
+        state = json.dumps({
+            'correct_map': {'q1': {'attempts': 10, 'msg': '{"attempts": 20}'}},
+            'attempts': 3,
+            'student_answers': {'q1': ['a', 'b']},
+        })
+        self.assertEqual(
+            get_state_fields(state, ('attempts', 'student_answers', 'position')),
+            {'attempts': 3, 'student_answers': {'q1': ['a', 'b']}}
+        )
+        self.assertEqual(get_state_field(state, 'position', 1), 1)
+
+    def test_key_in_string(self):
+        """
+        Verify that the key inside the string value is not taken for the field.
+        """
+        state = '{"msg": "text \\\\\\"position\\": {5 \\\\", "nested": {"position": 3}, "position": 2}'
+        self.assertEqual(get_state_field(state, 'position'), 2)
+        self.assertIsNone(get_state_field(json.dumps({'msg': '"position": 5'}), 'position'))
@@ -0,0 +1,43 @@
+"""
+Test for the suggestions of the course.
+"""
+from django.test import TestCase
+
+from rg_instructor_analytics.utils.suggestion import FunnelSuggestion, ProblemSuggestion
+
+
+class TestSuggestion(TestCase):
+    """
+    Test for the suggestions, generated from the analytics snapshot of the course.
+    """
+
+    SNAPSHOT = {
+        'funnel': [
+            {
+                'level': 0, 'name': 'Section', 'id': 'section', 'student_count': 10, 'student_count_in': 0,
+                'children': [
+                    {'level': 1, 'name': 'Stuck', 'id': 'stuck', 'student_count': 10, 'student_count_in': 8},
+                    {'level': 1, 'name': 'Passed', 'id': 'passed', 'student_count': 10, 'student_count_in': 1},
+                    {'level': 1, 'name': 'Next', 'id': 'next', 'student_count': 10, 'student_count_in': 1},
+                ],
+            },
+        ],
+        'homework': {
+            'correct_answer': [0.9, 0.1, 0.8, 0.85],
+            'attempts': [1.0, 1.0, 1.0, 1.0],
+            'problems': [[], [], [], []],
+            'names': ['HW 1', 'HW 2', 'HW 3', 'HW 4'],
+            'subsection_id': ['hw1', 'hw2', 'hw3', 'hw4'],
+        },
+    }
+
+    def test_suggestions(self):
+        """
+        Verify that suggestions point to the outliers and the snapshot is not changed.
+        """
+        funnel = FunnelSuggestion().get_suggestion_list(self.SNAPSHOT)
+        self.assertEqual([item['location']['child']['value'] for item in funnel], ['stuck'])
+
+        problems = ProblemSuggestion().get_suggestion_list(self.SNAPSHOT)
+        self.assertEqual([item['location']['child']['value'] for item in problems], ['hw2'])
+        self.assertNotIn('success', self.SNAPSHOT['homework'])
@@ -0,0 +1,69 @@
+"""
+Test for the tab fragment and the course info api.
+"""
+from datetime import datetime
+import json
+from time import mktime
+
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+from mock import Mock, patch
+
+from openedx.core.djangoapps.content.course_overviews.tests.factories import CourseOverviewFactory
+from rg_instructor_analytics.views.TabFragment import CourseInfoView, InstructorAnalyticsFragmentView
+from student.tests.factories import UserFactory
+
+
+class TestTabFragment(TestCase):
+    """
+    Test for the tab fragment and the course info api.
+    """
+
+    START = datetime(2018, 1, 1)
+
+    def setUp(self):
+        """
+        Implement from base class.
+        """
+        cache.clear()
+        self.overviews = [
+            CourseOverviewFactory(
+                display_name='Current', enrollment_start=None, start=self.START, enrollment_end=None, end=None
+            ),
+            CourseOverviewFactory(display_name='Other'),
+        ]
+        self.request = RequestFactory().post('/api/course_info/')
+        self.request.user = UserFactory(is_staff=True)
+
+    def test_course_info(self):
+        """
+        Verify that course info contains the course id and the enrollment dates of the course.
+        """
+        course_key = self.overviews[0].id
+        response = CourseInfoView().process(self.request, course_key=course_key, course_id=unicode(course_key))
+        self.assertEqual(json.loads(response.content), {
+            'course_id': unicode(course_key),
+            'enroll_info': {'enroll_start': mktime(self.START.timetuple()), 'enroll_end': 'null'},
+        })
+
+    def test_fragment_enroll_info(self):
+        """
+        Verify that the fragment embeds enrollment info of the current course only.
+        """
+        overview = self.overviews[0]
+        course = Mock(
+            id=overview.id, display_name='Current', enrollment_start=None, start=self.START, enrollment_end=None,
+            end=None,
+        )
+        with patch('rg_instructor_analytics.views.TabFragment.render_to_string', return_value='') as render:
+            InstructorAnalyticsFragmentView().process(
+                self.request, course_key=overview.id, course=course, course_id=unicode(overview.id)
+            )
+
+        context = render.call_args[0][1]
+        self.assertEqual(json.loads(context['enroll_info']), {
+            unicode(overview.id): {'enroll_start': mktime(self.START.timetuple()), 'enroll_end': 'null'},
+        })
+        self.assertEqual(
+            [course_info['course_name'] for course_info in context['available_courses']], ['Current', 'Other']
+        )
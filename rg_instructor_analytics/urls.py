@@ -3,7 +3,8 @@ Url config file.
 """
 from django.conf.urls import url
 
-from rg_instructor_analytics.views.Cohort import CohortSendMessage, CohortView
+from rg_instructor_analytics.views.Batch import BatchView
+from rg_instructor_analytics.views.Cohort import CohortSendMessage, CohortStudentsView, CohortView
 from rg_instructor_analytics.views.Enrollment import EnrollmentStatisticView
 from rg_instructor_analytics.views.Funnel import GradeFunnelView
 from rg_instructor_analytics.views.Gradebook import GradebookView
@@ -11,7 +12,9 @@ from rg_instructor_analytics.views.Problem import (
     ProblemDetailView, ProblemHomeWorkStatisticView, ProblemQuestionView, ProblemsStatisticView
 )
 from rg_instructor_analytics.views.Suggestion import SuggestionView
-from rg_instructor_analytics.views.TabFragment import InstructorAnalyticsFragmentView
+from rg_instructor_analytics.views.TabFragment import (
+    CourseInfoView, CourseListView, InstructorAnalyticsFragmentView
+)
 
 urlpatterns = [
     url(r'^api/enroll_statics/$', EnrollmentStatisticView.as_view(), name='enrollment_statistic_view'),
@@ -32,11 +35,19 @@ urlpatterns = [
 
     url(r'^api/cohort/$', CohortView.as_view(), name='cohort_view'),
 
+    url(r'^api/cohort/students/$', CohortStudentsView.as_view(), name='cohort_students'),
+
     url(r'^api/cohort/send_email/$', CohortSendMessage.as_view(), name='send_email_to_cohort'),
 
     url(r'^api/funnel/$', GradeFunnelView.as_view(), name='funnel'),
 
     url(r'^api/suggestion/$', SuggestionView.as_view(), name='suggestion'),
 
+    url(r'^api/batch/$', BatchView.as_view(), name='batch'),
+
+    url(r'^api/courses/$', CourseListView.as_view(), name='course_list'),
+
+    url(r'^api/course_info/$', CourseInfoView.as_view(), name='course_info'),
+
     url(r'^', InstructorAnalyticsFragmentView.as_view(), name='instructor_analytics_dashboard'),
 ]
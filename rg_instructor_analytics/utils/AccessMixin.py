@@ -9,8 +9,8 @@ from django.http.response import HttpResponseForbidden
 from opaque_keys import InvalidKeyError
 from opaque_keys.edx.keys import CourseKey
 
-from courseware.access import has_access
-from courseware.courses import get_course_by_id
+from rg_instructor_analytics.utils.resolver import get_course, user_has_access
+from rg_instructor_analytics.utils.response_cache import cached_response
 
 logging.basicConfig()
 
@@ -25,6 +25,8 @@ class AccessMixin(object):
     __metaclass__ = ABCMeta
 
     group_name = 'staff'
+    # Lifetime of the cached responses in seconds, None - responses are not cached.
+    cache_timeout = None
 
     @abstractmethod
     def process(self, request, **kwargs):
@@ -36,6 +38,8 @@ class AccessMixin(object):
     def base_process(self, request, course_id):
         """
         Preprocess request, check permission and select course.
+
+        Course and access decision are memoized for a short time, see `rg_instructor_analytics.utils.resolver`.
         """
         course_id = request.POST.get('course_id', course_id)
         try:
@@ -45,12 +49,15 @@ class AccessMixin(object):
                       course_id)
             return HttpResponseBadRequest()
 
-        course = get_course_by_id(course_key, depth=0)
-        if not has_access(request.user, self.group_name, course):
+        course = get_course(course_key)
+        if not user_has_access(request.user, self.group_name, course):
             log.error("Statistics not available for user type `%s`", request.user)
             return HttpResponseForbidden()
 
-        return self.process(request, course_key=course_key, course=course, course_id=course_id)
+        return cached_response(
+            self, request, course_key,
+            lambda: self.process(request, course_key=course_key, course=course, course_id=course_id)
+        )
 
     def post(self, request, course_id):
         """
@@ -0,0 +1,92 @@
+"""
+Module for the cohorts of the students by the total grade.
+
+Cohorts are defined by the thresholds of the total grade: the first cohort contains students with zero progress,
+cohort `i` contains students with the grade in `[thresholds[i - 1]; thresholds[i])` and the last cohort
+contains all students above its lower threshold.
+"""
+import json
+import math
+
+from django.db.models import Avg, Case, Count, F, IntegerField, Q, Value, When
+
+# Min difference between neighbour thresholds.
+MIN_THRESHOLDS_DIFF = 1.0 / 100.0
+
+
+def get_thresholds(mean, std):
+    """
+    Return thresholds of the cohorts for the given mean and standard deviation of the total grade.
+
+    Thresholds are 0:(m - 3s):(m - 0.5s):(m + 0.5s):(m + 3s):1, values out of [0; 1] and values with the
+    difference less than 1 percent are skipped.
+    """
+    thresholds = [0.0]
+    for value in (mean - 3 * std, mean - 0.5 * std, mean + 0.5 * std, mean + 3 * std, 1.0):
+        if 0.0 <= value <= 1.0 and abs(thresholds[-1] - value) >= MIN_THRESHOLDS_DIFF:
+            thresholds.append(float(value))
+    return thresholds
+
+
+def cohort_filter(thresholds, index, field='total'):
+    """
+    Return Q object, that selects students of the cohort with the given index.
+
+    :raise ValueError: if the index is out of the thresholds.
+    """
+    if not 0 <= index < len(thresholds):
+        raise ValueError('Unknown cohort {}'.format(index))
+    if index == 0:
+        return Q(**{'{}__lte'.format(field): thresholds[0]})
+    cohort = Q(**{'{}__gte'.format(field): thresholds[index - 1]}) & Q(**{'{}__gt'.format(field): thresholds[0]})
+    if index < len(thresholds) - 1:
+        cohort &= Q(**{'{}__lt'.format(field): thresholds[index]})
+    return cohort
+
+
+def parse_thresholds(value):
+    """
+    Return thresholds from the json list of the request.
+
+    :raise ValueError: if the thresholds are malformed.
+    """
+    thresholds = json.loads(value)
+    if (
+        not isinstance(thresholds, list) or not thresholds or
+        not all(isinstance(threshold, (int, float)) for threshold in thresholds) or
+        thresholds != sorted(thresholds)
+    ):
+        raise ValueError('Malformed thresholds')
+    return [float(threshold) for threshold in thresholds]
+
+
+def get_grade_summary(students, field='total'):
+    """
+    Return count, mean and population standard deviation of the students grade, computed by the database.
+
+    Deviation is computed from the mean of the squares, so the database does not need STDDEV support.
+    """
+    summary = students.aggregate(count=Count('id'), mean=Avg(field), square_mean=Avg(F(field) * F(field)))
+    if not summary['count']:
+        return 0, 0.0, 0.0
+    variance = summary['square_mean'] - summary['mean'] ** 2
+    return summary['count'], summary['mean'], math.sqrt(max(variance, 0.0))
+
+
+def get_cohort_counts(students, thresholds, field='total'):
+    """
+    Return count of the students in each cohort, computed by the single grouped query.
+    """
+    cohort = Case(
+        *[When(cohort_filter(thresholds, index, field), then=Value(index)) for index in range(len(thresholds))],
+        output_field=IntegerField()
+    )
+    counts = dict(
+        students
+        .annotate(cohort=cohort)
+        .values('cohort')
+        .annotate(count=Count('id'))
+        .order_by()
+        .values_list('cohort', 'count')
+    )
+    return [counts.get(index, 0) for index in range(len(thresholds))]
@@ -0,0 +1,98 @@
+"""
+Module for the cached outline of the course.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+from courseware.courses import get_course_by_id
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+from rg_instructor_analytics.utils.resolver import TTLCache
+
+COURSE_STRUCTURE_TIMEOUT = getattr(settings, 'RG_ANALYTICS_COURSE_STRUCTURE_TIMEOUT', 24 * 60 * 60)
+COURSE_STRUCTURE_KEY = 'rg_analytics:course_structure:{course}:{version}'
+
+# Versions of the courses, memoized for a short time, so the views and the suggestion providers,
+# that need the outline in the same moment, check the version once.
+_course_versions = TTLCache()
+
+
+def structure_element(element, **kwargs):
+    """
+    Return compact representation of the course item.
+    """
+    return dict(
+        id=element.location.to_deprecated_string(),
+        name=element.display_name,
+        children=[],
+        **kwargs
+    )
+
+
+def build_course_structure(course_key):
+    """
+    Load the course from the modulestore and return its outline.
+
+    Outline is the list of sections, each item has `id`, `name` and `children`:
+    sections -> subsections (with `graded` flag) -> units -> problems.
+    """
+    structure = []
+    course = get_course_by_id(course_key, depth=4)
+    for section in course.get_children():
+        section_info = structure_element(section)
+        for subsection in section.get_children():
+            subsection_info = structure_element(subsection, graded=bool(subsection.graded))
+            for unit in subsection.get_children():
+                unit_info = structure_element(unit)
+                unit_info['children'] = [
+                    structure_element(child) for child in unit.get_children() if child.location.category == 'problem'
+                ]
+                subsection_info['children'].append(unit_info)
+            section_info['children'].append(subsection_info)
+        structure.append(section_info)
+    return structure
+
+
+def format_course_version(modified):
+    """
+    Return the content version of the course by the time of the course overview modification.
+    """
+    return modified.strftime('%Y%m%d%H%M%S%f') if modified else 'unknown'
+
+
+def get_course_version(course_key):
+    """
+    Return the content version of the course.
+
+    Course overview is recreated on each course publish, so the time of its modification changes
+    together with the content of the course.
+    """
+    return format_course_version(
+        CourseOverview.objects.filter(id=course_key).values_list('modified', flat=True).first()
+    )
+
+
+def get_course_versions(course_keys):
+    """
+    Return the content versions of the given courses, loaded with one query.
+    """
+    modified = dict(CourseOverview.objects.filter(id__in=course_keys).values_list('id', 'modified'))
+    return {course_key: format_course_version(modified.get(course_key)) for course_key in course_keys}
+
+
+def get_memoized_course_version(course_key):
+    """
+    Return the content version of the course, memoized for a short time.
+    """
+    return _course_versions.get_or_set(course_key, lambda: get_course_version(course_key))
+
+
+def get_course_structure(course_key):
+    """
+    Return the outline of the course from the cache, build it on the cache miss.
+    """
+    key = COURSE_STRUCTURE_KEY.format(course=course_key, version=get_memoized_course_version(course_key))
+    structure = cache.get(key)
+    if structure is None:
+        structure = build_course_structure(course_key)
+        cache.set(key, structure, COURSE_STRUCTURE_TIMEOUT)
+    return structure
@@ -0,0 +1,104 @@
+"""
+Module for the list of the courses, available for the user in the analytics dashboard.
+
+List is built from the course overviews only, without loading of the courses from the modulestore,
+and cached per user. Cached list is dropped, when the course access roles of the user are changed,
+and all lists are dropped, when a course overview is changed.
+"""
+from time import mktime
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+from student.models import CourseAccessRole
+
+COURSE_LIST_TIMEOUT = getattr(settings, 'RG_ANALYTICS_COURSE_LIST_TIMEOUT', 60 * 60)
+COURSE_LIST_KEY = 'rg_analytics:course_list:{user}:{generation}'
+COURSE_LIST_GENERATION_KEY = 'rg_analytics:course_list_generation'
+# Course access roles, that give access to the analytics of the course.
+COURSE_ROLES = ('instructor', 'staff')
+
+
+def get_enroll_info(course):
+    """
+    Return enroll_start and enroll_end for given course.
+    """
+    enroll_start = course.enrollment_start
+    if enroll_start is None:
+        enroll_start = course.start
+
+    enroll_end = course.enrollment_end
+    if enroll_end is None:
+        enroll_end = course.end
+
+    return {
+        'enroll_start': mktime(enroll_start.timetuple()) if enroll_start else 'null',
+        'enroll_end': mktime(enroll_end.timetuple()) if enroll_end else 'null',
+    }
+
+
+def build_course_list(user):
+    """
+    Return courses, available for the given user, ordered by name.
+
+    Staff user has access to all courses of the platform, other users - to the courses,
+    where they have instructor or staff role.
+    """
+    courses = CourseOverview.objects.all()
+    if not user.is_staff:
+        courses = courses.filter(
+            id__in=CourseAccessRole.objects.filter(user=user, role__in=COURSE_ROLES).values('course_id')
+        )
+    courses = (
+        courses
+        .only('id', 'display_name')
+        .order_by('display_name', 'id')
+    )
+    return [
+        {
+            'course_id': unicode(course.id),
+            'course_name': unicode(course.display_name or course.id),
+        }
+        for course in courses
+    ]
+
+
+def get_generation():
+    """
+    Return current generation of the cached course lists.
+    """
+    generation = cache.get(COURSE_LIST_GENERATION_KEY)
+    if generation is None:
+        cache.add(COURSE_LIST_GENERATION_KEY, uuid4().hex, None)
+        generation = cache.get(COURSE_LIST_GENERATION_KEY)
+    return generation
+
+
+def get_available_courses(user):
+    """
+    Return cached list of the courses, available for the given user.
+
+    Each item is a dict with `course_id` and `course_name` of the course.
+    """
+    key = COURSE_LIST_KEY.format(user=user.id, generation=get_generation())
+    courses = cache.get(key)
+    if courses is None:
+        courses = build_course_list(user)
+        cache.set(key, courses, COURSE_LIST_TIMEOUT)
+    return courses
+
+
+def invalidate_user_courses(user_id):
+    """
+    Drop cached course list of the user.
+    """
+    cache.delete(COURSE_LIST_KEY.format(user=user_id, generation=get_generation()))
+
+
+def invalidate_course_lists():
+    """
+    Drop cached course lists of all users.
+    """
+    cache.set(COURSE_LIST_GENERATION_KEY, uuid4().hex, None)
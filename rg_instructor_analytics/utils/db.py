@@ -0,0 +1,150 @@
+"""
+Module with database helpers for the statistic collectors.
+"""
+from contextlib import contextmanager
+from itertools import islice
+from operator import or_
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.test.utils import CaptureQueriesContext
+
+BULK_BATCH_SIZE = getattr(settings, 'RG_ANALYTICS_BULK_BATCH_SIZE', 1000)
+
+
+def iter_batches(items, batch_size=BULK_BATCH_SIZE):
+    """
+    Split given iterable into lists with at most `batch_size` items.
+    """
+    iterator = iter(items)
+    batch = list(islice(iterator, batch_size))
+    while batch:
+        yield batch
+        batch = list(islice(iterator, batch_size))
+
+
+def _normalize(model, row, fields):
+    """
+    Return tuple of the python values of the given fields of the row.
+    """
+    return tuple(model._meta.get_field(f).to_python(row[f]) for f in fields)
+
+
+def keys_filter(key_fields, keys):
+    """
+    Return Q object, that selects rows with the given keys.
+
+    Keys are grouped by all fields except the last one, so for the `('course_id', 'student_id')` key
+    the result is one `student_id IN (...)` clause per course.
+    """
+    groups = {}
+    for key in keys:
+        groups.setdefault(key[:-1], []).append(key[-1])
+    return reduce(or_, [
+        Q(**dict(zip(key_fields[:-1], prefix), **{key_fields[-1] + '__in': values}))
+        for prefix, values in groups.iteritems()
+    ])
+
+
+def _mysql_upsert(model, rows, fields, update_fields):
+    """
+    Write rows with the single `INSERT ... ON DUPLICATE KEY UPDATE` statement.
+    """
+    meta = model._meta
+    quote_name = connection.ops.quote_name
+    placeholder = '({})'.format(', '.join(['%s'] * len(fields)))
+    sql = 'INSERT INTO {table} ({columns}) VALUES {values} ON DUPLICATE KEY UPDATE {updates}'.format(
+        table=quote_name(meta.db_table),
+        columns=', '.join(quote_name(meta.get_field(f).column) for f in fields),
+        values=', '.join([placeholder] * len(rows)),
+        updates=', '.join('{0} = VALUES({0})'.format(quote_name(meta.get_field(f).column)) for f in update_fields),
+    )
+    params = [meta.get_field(f).get_db_prep_save(row[f], connection) for row in rows for f in fields]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+
+
+def bulk_upsert(model, rows, key_fields, update_fields, batch_size=BULK_BATCH_SIZE):
+    """
+    Insert new and update changed rows of the given model.
+
+    :param model: model class with unique constraint over `key_fields`.
+    :param rows: iterable of dicts with values for `key_fields` and `update_fields`
+        (foreign keys are addressed by attname, i.e. `student_id`).
+    :param key_fields: tuple of the fields, that identify the row.
+    :param update_fields: tuple of the fields, that are written for the existing rows.
+    :param batch_size: count of rows, processed in one transaction.
+    :return: count of the written (inserted or updated) rows.
+
+    Each batch is diffed against stored rows, so unchanged rows are not written at all,
+    and is committed in its own transaction, so readers are never blocked by the whole collection run.
+    On MySQL new and changed rows are written with one `INSERT ... ON DUPLICATE KEY UPDATE`,
+    other backends use `bulk_create` for new rows and per-row update for the changed ones.
+    """
+    key_fields, update_fields = tuple(key_fields), tuple(update_fields)
+    written = 0
+    for batch in iter_batches(rows, batch_size):
+        batch = {_normalize(model, row, key_fields): row for row in batch}
+        existing = {
+            _normalize(model, stored, key_fields): stored
+            for stored in model.objects.filter(keys_filter(key_fields, batch.keys()))
+                                       .values('pk', *(key_fields + update_fields))
+        }
+        new_rows, changed_rows = [], []
+        for key, row in batch.iteritems():
+            stored = existing.get(key)
+            if stored is None:
+                new_rows.append(row)
+            elif _normalize(model, stored, update_fields) != _normalize(model, row, update_fields):
+                changed_rows.append((stored['pk'], row))
+
+        if not (new_rows or changed_rows):
+            continue
+
+        with transaction.atomic():
+            if connection.vendor == 'mysql':
+                _mysql_upsert(model, new_rows + [row for _, row in changed_rows], key_fields + update_fields,
+                              update_fields)
+            else:
+                model.objects.bulk_create([
+                    model(**{f: row[f] for f in key_fields + update_fields}) for row in new_rows
+                ])
+                for pk, row in changed_rows:
+                    model.objects.filter(pk=pk).update(**{f: row[f] for f in update_fields})
+        written += len(new_rows) + len(changed_rows)
+    return written
+
+
+class QueryCounter(object):
+    """
+    Counter of the database queries, issued inside the `count` contexts.
+    """
+
+    def __init__(self, enabled=True):
+        """
+        Construct counter; disabled counter does not capture queries at all.
+        """
+        self.enabled = enabled
+        self.queries = 0
+        self.calls = 0
+
+    @contextmanager
+    def count(self):
+        """
+        Count queries of the one call.
+        """
+        if not self.enabled:
+            yield
+            return
+        with CaptureQueriesContext(connection) as context:
+            yield
+        self.queries += len(context)
+        self.calls += 1
+
+    @property
+    def per_call(self):
+        """
+        Return average count of the queries per one call.
+        """
+        return float(self.queries) / self.calls if self.calls else 0.0
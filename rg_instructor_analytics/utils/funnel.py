@@ -0,0 +1,112 @@
+"""
+Module for the funnel of the course, shared by the funnel tab and the suggestions.
+"""
+from django.db.models import Count
+
+from rg_instructor_analytics.models import LastVisitedSubsection
+from rg_instructor_analytics.utils.course_structure import get_course_structure
+from student.models import CourseEnrollment
+
+
+def info_for_course_element(element, level):
+    """
+    Return new element of the course item.
+    """
+    return {
+        'level': level,
+        'name': element['name'],
+        'id': element['id'],
+        'student_count': 0,
+        'student_count_in': 0,
+        'student_count_out': 0,
+        'children': [],
+    }
+
+
+def add_as_child(element, child):
+    """
+    Append to dictionary new element, named children.
+    """
+    element['children'].append(child)
+
+
+def get_progress_info_for_subsection(course_key, ignored_modes=()):
+    """
+    Return activity for each of the section.
+
+    Activity is the count of students, whose last visited unit is the given unit of the subsection.
+    Students, enrolled in the `ignored_modes`, are not counted.
+    """
+    info = LastVisitedSubsection.objects.filter(course_id=course_key)
+    if ignored_modes:
+        users = (
+            CourseEnrollment.objects
+            .filter(course_id=course_key, mode__in=ignored_modes)
+            .values_list('user', flat=True)
+        )
+        info = info.exclude(student__in=users)
+    info = (
+        info
+        .values('module_state_key', 'position')
+        .order_by('module_state_key', 'position')
+        .annotate(count=Count('id'))
+        .values('module_state_key', 'position', 'count')
+    )
+    result = {}
+    for i in info:
+        if i['module_state_key'] not in result:
+            result[i['module_state_key']] = []
+        result[i['module_state_key']].append({
+            'count': i['count'],
+            'offset': i['position']
+        })
+
+    return result
+
+
+def get_course_info(course_key, subsection_activity):
+    """
+    Return information about the course in tree view.
+    """
+    course_info = []
+    for section in get_course_structure(course_key):
+        section_info = info_for_course_element(section, level=0)
+        for subsection in section['children']:
+            subsection_info = info_for_course_element(subsection, level=1)
+            for unit in subsection['children']:
+                unit_info = info_for_course_element(unit, level=2)
+                for problem in unit['children']:
+                    add_as_child(unit_info, info_for_course_element(problem, level=3))
+                add_as_child(subsection_info, unit_info)
+            add_as_child(section_info, subsection_info)
+            if subsection_info['id'] in subsection_activity:
+                for u in subsection_activity[subsection_info['id']]:
+                    subsection_info['children'][u['offset'] - 1]['student_count'] = u['count']
+                    subsection_info['student_count'] += u['count']
+                section_info['student_count'] += subsection_info['student_count']
+        course_info.append(section_info)
+    return course_info
+
+
+def append_inout_info(statistic, accomulate=0):
+    """
+    Append information about how many student in course.
+    """
+    for i in reversed(statistic):
+        i['student_count_out'] = accomulate
+        if len(i['children']):
+            append_inout_info(i['children'], accomulate=accomulate)
+        accomulate += i['student_count']
+        i['student_count_in'] = accomulate
+
+
+def get_funnel_info(course_key, ignored_modes=()):
+    """
+    Return course info in the tree-like structure.
+
+    Structure of the node described inside function info_for_course_element.
+    """
+    subsection_activity = get_progress_info_for_subsection(course_key, ignored_modes)
+    courses_structure = get_course_info(course_key, subsection_activity)
+    append_inout_info(courses_structure)
+    return courses_structure
@@ -0,0 +1,75 @@
+"""
+Module for the homework statistic of the course, shared by the problems tab and the suggestions.
+"""
+from itertools import chain
+
+from rg_instructor_analytics.models import ProblemStatistic
+from rg_instructor_analytics.utils.course_structure import get_course_structure
+
+
+def academic_performance_request(course_key):
+    """
+    Make request to db for academic performance.
+
+    Return list, where each item contain id of the problem and the precollected statistic of it.
+    """
+    return (
+        ProblemStatistic.objects
+        .filter(course_id=course_key)
+        .values('module_state_key', 'sum_grade', 'sum_max_grade', 'attempts_sum', 'attempts_count')
+    )
+
+
+def get_academic_performance(course_key):
+    """
+    Provide map, where key - course and value - map with average grade and attempt.
+    """
+    return {
+        i['module_state_key']: {
+            'grade_avg': i['sum_max_grade'] and i['sum_grade'] / i['sum_max_grade'],
+            'attempts_avg': i['attempts_count'] and float(i['attempts_sum']) / i['attempts_count'],
+        }
+        for i in academic_performance_request(course_key)
+    }
+
+
+def get_homework_stat(course_key):
+    """
+    Provide statistic for given course.
+
+    :param course_key:  object, that represent course.
+    :return: map with list of correct answers, attempts, list of the problems for unit and names.
+    Each item of given list represent one unit.
+    """
+    academic_performance = get_academic_performance(course_key)
+    course_structure = get_course_structure(course_key)
+    stat = {'correct_answer': [], 'attempts': [], 'problems': [], 'names': [], 'subsection_id': []}
+    hw_number = 0
+
+    for subsection in chain.from_iterable(section['children'] for section in course_structure):
+        if not subsection['graded']:
+            continue
+        hw_number += 1
+        stat['correct_answer'].append(0)
+        stat['attempts'].append(0)
+        stat['problems'].append([])
+        stat['names'].append(subsection['name'])
+        stat['subsection_id'].append(subsection['id'])
+
+        problems_in_hw = 0
+
+        for problem in chain.from_iterable(unit['children'] for unit in subsection['children']):
+            problem_id = problem['id']
+            if problem_id in academic_performance:
+                current_performance = academic_performance[problem_id]
+                stat['correct_answer'][-1] += current_performance['grade_avg']
+                stat['attempts'][-1] += current_performance['attempts_avg']
+                problems_in_hw += 1
+
+            stat['problems'][-1].append(problem_id)
+
+        if problems_in_hw > 0:
+            stat['correct_answer'][-1] /= problems_in_hw
+            stat['attempts'][-1] /= problems_in_hw
+
+    return stat
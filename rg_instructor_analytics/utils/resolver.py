@@ -0,0 +1,114 @@
+"""
+Module for the short-lived memoization of the course and access resolution.
+
+Course descriptors can not be stored in the django cache, so they are memoized in the thread for
+`RESOLVER_TIMEOUT` seconds (descriptors are not thread-safe, so the requests, processed concurrently
+by the different threads, do not share them). Access decisions are stored in the django cache for the same time
+and dropped, when the course access roles (including the org-wide roles) or the staff, superuser and active
+flags of the user are changed.
+"""
+from collections import OrderedDict
+from threading import local, Lock
+from time import time
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+
+from courseware.access import has_access
+from courseware.courses import get_course_by_id
+
+RESOLVER_TIMEOUT = getattr(settings, 'RG_ANALYTICS_RESOLVER_TIMEOUT', 60)
+RESOLVER_MAX_ITEMS = 100
+ACCESS_KEY = 'rg_analytics:access:{user}:{generation}:{group}:{course}'
+ACCESS_GENERATION_KEY = 'rg_analytics:access_generation:{user}'
+
+
+class TTLCache(object):
+    """
+    Thread-safe in-process cache with the limited lifetime and count of the items.
+
+    The oldest items are dropped, when the count of the items exceeds `max_items`.
+    """
+
+    def __init__(self, timeout=RESOLVER_TIMEOUT, max_items=RESOLVER_MAX_ITEMS):
+        """
+        Construct empty cache.
+        """
+        self.timeout = timeout
+        self.max_items = max_items
+        self.items = OrderedDict()
+        self.lock = Lock()
+
+    def get_or_set(self, key, compute):
+        """
+        Return cached value of the key, call `compute` and cache its result on the cache miss.
+        """
+        now = time()
+        with self.lock:
+            item = self.items.get(key)
+        if item is not None and item[0] > now:
+            return item[1]
+
+        value = compute()
+        with self.lock:
+            self.items.pop(key, None)
+            self.items[key] = (now + self.timeout, value)
+            while len(self.items) > self.max_items:
+                self.items.popitem(last=False)
+        return value
+
+    def clear(self):
+        """
+        Drop all items.
+        """
+        with self.lock:
+            self.items.clear()
+
+
+_thread_data = local()
+
+
+def get_course(course_key):
+    """
+    Return course descriptor (without children) of the given course, memoized in the current thread.
+
+    :raise Http404: if the course does not exist.
+    """
+    courses = getattr(_thread_data, 'courses', None)
+    if courses is None:
+        courses = _thread_data.courses = TTLCache()
+    return courses.get_or_set(course_key, lambda: get_course_by_id(course_key, depth=0))
+
+
+def get_access_generation(user_id):
+    """
+    Return current generation of the cached access decisions of the user.
+    """
+    key = ACCESS_GENERATION_KEY.format(user=user_id)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, uuid4().hex, None)
+        generation = cache.get(key)
+    return generation
+
+
+def user_has_access(user, group, course):
+    """
+    Return True, if the user has the access of the given group to the course.
+    """
+    if user.id is None:
+        return bool(has_access(user, group, course, course.id))
+    key = ACCESS_KEY.format(user=user.id, generation=get_access_generation(user.id), group=group, course=course.id)
+    allowed = cache.get(key)
+    if allowed is None:
+        allowed = bool(has_access(user, group, course, course.id))
+        cache.set(key, allowed, RESOLVER_TIMEOUT)
+    return allowed
+
+
+def invalidate_user_access(user_id):
+    """
+    Drop cached access decisions of the user for all courses.
+    """
+    cache.set(ACCESS_GENERATION_KEY.format(user=user_id), uuid4().hex, None)
@@ -0,0 +1,90 @@
+"""
+Module for the cache of the analytics api responses.
+"""
+from hashlib import md5
+import json
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+RESPONSE_KEY = 'rg_analytics:response:{view}:{course}:{generation}:{params}'
+GENERATION_KEY = 'rg_analytics:response_generation:{course}'
+# Request parameters, that do not affect the response.
+IGNORED_PARAMS = frozenset(['course_id', 'csrfmiddlewaretoken'])
+
+
+def get_generation(course_key):
+    """
+    Return current generation of the cached responses of the course.
+    """
+    key = GENERATION_KEY.format(course=course_key)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, uuid4().hex, None)
+        generation = cache.get(key)
+    return generation
+
+
+def get_generations(course_keys):
+    """
+    Return current generations of the cached responses of the given courses, loaded with one cache request.
+    """
+    keys = {GENERATION_KEY.format(course=course_key): course_key for course_key in course_keys}
+    generations = cache.get_many(keys.keys())
+    return {
+        course_key: generations[key] if key in generations else get_generation(course_key)
+        for key, course_key in keys.iteritems()
+    }
+
+
+def invalidate_course_responses(course_key):
+    """
+    Drop all cached responses of the course, called when collectors have updated the course statistic.
+    """
+    cache.set(GENERATION_KEY.format(course=course_key), uuid4().hex, None)
+
+
+def response_cache_key(view_name, course_key, params):
+    """
+    Return cache key of the response.
+
+    :param params: QueryDict with request parameters; parameters are sorted by name,
+        while order of the values is kept, because it may define order of the response items.
+    """
+    normalized = sorted((name, values) for name, values in params.lists() if name not in IGNORED_PARAMS)
+    return RESPONSE_KEY.format(
+        view=view_name,
+        course=course_key,
+        generation=get_generation(course_key),
+        params=md5(json.dumps(normalized)).hexdigest(),
+    )
+
+
+def get_cache_timeout(view):
+    """
+    Return lifetime of the cached responses of the given view, None if responses are not cached.
+
+    Default lifetime of the view can be overridden with `RG_ANALYTICS_RESPONSE_CACHE_TIMEOUTS`.
+    """
+    return getattr(settings, 'RG_ANALYTICS_RESPONSE_CACHE_TIMEOUTS', {}).get(type(view).__name__, view.cache_timeout)
+
+
+def cached_response(view, request, course_key, process):
+    """
+    Return cached response of the view or call `process` and cache its successful response.
+    """
+    timeout = get_cache_timeout(view)
+    if timeout is None or request.method != 'POST':
+        return process()
+
+    key = response_cache_key(type(view).__name__, course_key, request.POST)
+    cached = cache.get(key)
+    if cached is not None:
+        return HttpResponse(cached['content'], content_type=cached['content_type'])
+
+    response = process()
+    if isinstance(response, HttpResponse) and response.status_code == 200:
+        cache.set(key, {'content': response.content, 'content_type': response['Content-Type']}, timeout)
+    return response
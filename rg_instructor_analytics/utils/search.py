@@ -0,0 +1,88 @@
+"""
+Module for the search of the students in the gradebook.
+
+Search text of the student (lowercase username, names and email) is stored in the `GradeStatistic`,
+its trigrams are indexed in the `GradeStatisticTrigram`. Query, that is not shorter than the trigram,
+is resolved by the index, so the `LIKE '%query%'` scan is limited to the students, that have all trigrams
+of the query.
+"""
+from django.db import transaction
+from django.db.models import Count
+
+from rg_instructor_analytics.models import GradeStatistic, GradeStatisticTrigram
+from rg_instructor_analytics.utils.db import BULK_BATCH_SIZE, iter_batches
+
+SEARCH_USER_FIELDS = ('username', 'first_name', 'last_name', 'email')
+
+
+def get_search_text(user):
+    """
+    Return search text of the user.
+    """
+    return u' '.join(getattr(user, field) or u'' for field in SEARCH_USER_FIELDS).lower()
+
+
+def get_trigrams(text):
+    """
+    Return set of the trigrams of the text.
+    """
+    return {text[index:index + 3] for index in range(len(text) - 2)}
+
+
+def update_search_index(course_key, students):
+    """
+    Rebuild trigrams of the given students of the course, which search text has been changed.
+    """
+    for students_chunk in iter_batches(students):
+        search_texts = dict(
+            GradeStatistic.objects
+            .filter(course_id=course_key, student_id__in=students_chunk)
+            .values_list('student_id', 'search_text')
+        )
+        indexed = {}
+        trigrams = (
+            GradeStatisticTrigram.objects
+            .filter(course_id=course_key, student__in=students_chunk)
+            .values_list('student', 'trigram')
+        )
+        for student, trigram in trigrams:
+            indexed.setdefault(student, set()).add(trigram)
+
+        changed = {}
+        for student, search_text in search_texts.iteritems():
+            expected = get_trigrams(search_text)
+            if indexed.get(student, set()) != expected:
+                changed[student] = expected
+        if not changed:
+            continue
+        with transaction.atomic():
+            GradeStatisticTrigram.objects.filter(course_id=course_key, student__in=changed.keys()).delete()
+            GradeStatisticTrigram.objects.bulk_create(
+                [
+                    GradeStatisticTrigram(course_id=course_key, student=student, trigram=trigram)
+                    for student, student_trigrams in changed.iteritems() for trigram in student_trigrams
+                ],
+                batch_size=BULK_BATCH_SIZE,
+            )
+
+
+def search_students(students, course_key, query):
+    """
+    Filter grade statistic of the course students by the search query.
+
+    Trigrams narrow the students down, the search text removes false positives of the trigram match.
+    Matches are counted with `>=`, because case insensitive collation of the database may match extra trigrams.
+    """
+    query = query.lower()
+    trigrams = get_trigrams(query)
+    if trigrams:
+        matched = (
+            GradeStatisticTrigram.objects
+            .filter(course_id=course_key, trigram__in=trigrams)
+            .values('student')
+            .annotate(matches=Count('id'))
+            .filter(matches__gte=len(trigrams))
+            .values('student')
+        )
+        students = students.filter(student_id__in=matched)
+    return students.filter(search_text__contains=query)
@@ -0,0 +1,141 @@
+"""
+Module for the dense day-indexed series of the statistic.
+
+Item `i` of the series is the cumulative count at the end of the day `start + i`, so the count of any range
+of days is the difference of two items and the series of any range is a slice of the array.
+"""
+from array import array
+from datetime import date, timedelta
+
+# Signed 4-byte items, the same size of the packed series on all platforms.
+SERIES_TYPECODE = 'i'
+
+PERIODS = ('day', 'week', 'month')
+
+
+def get_period_starts(from_day, to_day, period):
+    """
+    Return first days of the periods, that intersect with the given range of days.
+
+    The first period starts at `from_day`, the next ones start on Monday (week) or on the first day of the month.
+
+    :raise ValueError: if the period is unknown.
+    """
+    if period not in PERIODS:
+        raise ValueError('Unknown period {}'.format(period))
+    if from_day > to_day:
+        return []
+    if period == 'day':
+        return [from_day + timedelta(days) for days in range((to_day - from_day).days + 1)]
+
+    starts = [from_day]
+    if period == 'week':
+        day = from_day + timedelta(7 - from_day.weekday())
+        while day <= to_day:
+            starts.append(day)
+            day += timedelta(7)
+    else:
+        year, month = from_day.year, from_day.month
+        while True:
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+            day = date(year, month, 1)
+            if day > to_day:
+                break
+            starts.append(day)
+    return starts
+
+
+class DaySeries(object):
+    """
+    Cumulative counts by day, starting from the `start` day.
+
+    Counts before the `start` are zero, counts after the last day are equal to the last count.
+    """
+
+    def __init__(self, start=None, values=None):
+        """
+        Construct series from the array of the counts.
+        """
+        self.start = start
+        self.values = values if values is not None else array(SERIES_TYPECODE)
+
+    @classmethod
+    def unpack(cls, start, blob):
+        """
+        Return series, stored by the `pack`.
+        """
+        values = array(SERIES_TYPECODE)
+        if blob:
+            values.fromstring(blob.tobytes() if isinstance(blob, memoryview) else bytes(blob))
+        return cls(start, values)
+
+    def pack(self):
+        """
+        Return series as bytes.
+        """
+        return self.values.tostring()
+
+    def add(self, changes, first_day=None, last_day=None):
+        """
+        Add changes of the counts, given as `{day: count}`.
+
+        Series is extended to cover days from `first_day` to `last_day` (changed days by default),
+        so the series of the different counts, updated with the same range, stay aligned.
+        """
+        first_day = first_day or min(changes)
+        last_day = last_day or max(changes)
+        if self.start is None:
+            self.start = first_day
+        if first_day < self.start:
+            self.values = array(SERIES_TYPECODE, [0] * (self.start - first_day).days) + self.values
+            self.start = first_day
+        missing = (last_day - self.start).days + 1 - len(self.values)
+        if missing > 0:
+            self.values.extend([self.values[-1] if self.values else 0] * missing)
+
+        deltas = {(day - self.start).days: count for day, count in changes.iteritems() if count}
+        if not deltas:
+            return
+        running = 0
+        for index in range(min(deltas), len(self.values)):
+            running += deltas.get(index, 0)
+            self.values[index] += running
+
+    def at(self, day):
+        """
+        Return count at the end of the day.
+        """
+        if not self.values or day < self.start:
+            return 0
+        return self.values[min((day - self.start).days, len(self.values) - 1)]
+
+    def cumulative(self, from_day, to_day):
+        """
+        Return counts at the end of each day of the range, including both ends.
+        """
+        length = (to_day - from_day).days + 1
+        if length <= 0:
+            return []
+        if not self.values:
+            return [0] * length
+        first = (from_day - self.start).days
+        last = first + length
+        return (
+            [0] * min(max(-first, 0), length) +
+            self.values[max(first, 0):max(min(last, len(self.values)), 0)].tolist() +
+            [self.values[-1]] * min(max(last - len(self.values), 0), length)
+        )
+
+    def get_period_counts(self, starts, to_day):
+        """
+        Return counts at the end of the day before the first period and at the end of each period.
+
+        Periods are given by the first days `starts` and the last day of the last period `to_day`.
+        """
+        if not starts:
+            return []
+        if (to_day - starts[0]).days + 1 == len(starts):
+            # Periods are days, so the counts are a slice of the series.
+            return self.cumulative(starts[0] - timedelta(1), to_day)
+        ends = [day - timedelta(1) for day in starts] + [to_day]
+        return [self.at(day) for day in ends]
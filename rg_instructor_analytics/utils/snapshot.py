@@ -0,0 +1,54 @@
+"""
+Module for the shared per-course analytics snapshot.
+
+Snapshot contains the funnel tree (without the audit students) and the homework statistic of the course.
+It is cached until the collectors update the statistic of the course or the course is published,
+so the consumers of the snapshot (i.e. suggestions) reuse one computation.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+from course_modes.models import CourseMode
+from rg_instructor_analytics.utils.course_structure import get_memoized_course_version
+from rg_instructor_analytics.utils.funnel import get_funnel_info
+from rg_instructor_analytics.utils.homework import get_homework_stat
+from rg_instructor_analytics.utils.response_cache import get_generation
+
+SNAPSHOT_TIMEOUT = getattr(settings, 'RG_ANALYTICS_SNAPSHOT_TIMEOUT', 24 * 60 * 60)
+SNAPSHOT_KEY = 'rg_analytics:{name}:{course}:{generation}:{version}'
+
+
+def get_snapshot_key(course_key, name='snapshot', generation=None, version=None):
+    """
+    Return cache key of the data, derived from the current statistic and content of the course.
+
+    Generation and version of the course are looked up, when they are not given.
+    """
+    return SNAPSHOT_KEY.format(
+        name=name,
+        course=course_key,
+        generation=generation or get_generation(course_key),
+        version=version or get_memoized_course_version(course_key),
+    )
+
+
+def build_course_snapshot(course_key):
+    """
+    Return funnel and homework statistic of the course.
+    """
+    return {
+        'funnel': get_funnel_info(course_key, [CourseMode.AUDIT]),
+        'homework': get_homework_stat(course_key),
+    }
+
+
+def get_course_snapshot(course_key):
+    """
+    Return cached snapshot of the course, build it on the cache miss.
+    """
+    key = get_snapshot_key(course_key)
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = build_course_snapshot(course_key)
+        cache.set(key, snapshot, SNAPSHOT_TIMEOUT)
+    return snapshot
@@ -0,0 +1,78 @@
+"""
+Module for extraction of the fields from the serialized state of the StudentModule.
+
+State of the problem contains a lot of data (correct map, input state, answers), while analytics usually
+needs one or two top level keys. Fields are located with the string search and only their values are decoded,
+so the rest of the state is never turned into python objects.
+"""
+import json
+import re
+
+_DECODER = json.JSONDecoder()
+_ESCAPE_RE = re.compile(r'\\.')
+_KEY_PATTERNS = {}
+
+_MISSING = object()
+
+
+def _key_pattern(key):
+    """
+    Return compiled pattern of the given key.
+    """
+    pattern = _KEY_PATTERNS.get(key)
+    if pattern is None:
+        pattern = _KEY_PATTERNS[key] = re.compile(r'"{}"\s*:\s*'.format(re.escape(key)))
+    return pattern
+
+
+def _is_top_level(state, position):
+    """
+    Check that the given position of the state is inside the root object and outside of the strings.
+
+    Escape sequences are dropped, so the quotes split the prefix into the strings (odd parts)
+    and the structure (even parts), which braces define the depth of the position.
+    """
+    if state.count('{', 0, position) == 1:
+        return True
+    prefix = state[:position]
+    if '\\' in prefix:
+        prefix = _ESCAPE_RE.sub('', prefix)
+    parts = prefix.split('"')
+    structure = ''.join(parts[::2])
+    return len(parts) % 2 == 1 and structure.count('{') - structure.count('}') == 1
+
+
+def _find_field(state, key):
+    """
+    Return decoded value of the top level key or `_MISSING`.
+    """
+    quoted_key = '"{}"'.format(key)
+    start = state.find(quoted_key)
+    while start != -1:
+        if state[start - 1] != '\\' and _is_top_level(state, start):
+            match = _key_pattern(key).match(state, start)
+            if match is not None:
+                return _DECODER.raw_decode(state, match.end())[0]
+        start = state.find(quoted_key, start + 1)
+    return _MISSING
+
+
+def get_state_fields(state, keys):
+    """
+    Return map with values of the given top level keys of the serialized state.
+
+    Keys, absent in the state, are absent in the result.
+    """
+    result = {}
+    for key in keys:
+        value = _find_field(state, key)
+        if value is not _MISSING:
+            result[key] = value
+    return result
+
+
+def get_state_field(state, key, default=None):
+    """
+    Return value of the top level key of the serialized state or default value.
+    """
+    return get_state_fields(state, (key,)).get(key, default)
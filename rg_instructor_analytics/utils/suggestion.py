@@ -0,0 +1,193 @@
+"""
+Module for the suggestions of the course, generated from the analytics snapshot of the course.
+"""
+from abc import ABCMeta, abstractmethod
+from itertools import izip
+
+from django.core.cache import cache
+import numpy as np
+
+from rg_instructor_analytics.utils.snapshot import get_course_snapshot, get_snapshot_key, SNAPSHOT_TIMEOUT
+
+
+class BaseSuggestion(object):
+    """
+    Base class for the suggestion generator.
+    """
+
+    __metaclass__ = ABCMeta
+
+    def __init__(self):
+        """
+        Construct suggestion.
+        """
+        super(BaseSuggestion, self).__init__()
+        self.suggestion = []
+
+    @abstractmethod
+    def suggestion_source(self, item_id):
+        """
+        Return Linked list structure, where head contains tab name and tail point to some position of the tab.
+
+        I.E.:
+            {
+                'value': 'parent',
+                'child': {
+                    'value': child_id
+                }
+            }
+        """
+        pass
+
+    def add_suggestion_item(self, description, item_id):
+        """
+        Add new suggestion item in to suggestion list.
+
+        :param description: description, that shown to a user.
+        :param item_id: id of the course item.
+        """
+        self.suggestion.append({
+            'description': description,
+            'location': self.suggestion_source(item_id),
+        })
+
+    def get_suggestion_list(self, snapshot):
+        """
+        Return suggestion list.
+
+        Generate new suggestion list from the analytics snapshot of the course and return it.
+        Also, new list will stored inside suggestion field of the current instance.
+        """
+        self.suggestion = []
+        self.generate_suggestion(snapshot)
+        return self.suggestion
+
+    @abstractmethod
+    def generate_suggestion(self, snapshot):
+        """
+        Use for generate suggestion for the course from its snapshot (see `rg_instructor_analytics.utils.snapshot`).
+
+        Abstract method with custom logic for generating new suggestion list.
+        For adding new suggestion item used function  `add_suggestion_item`.
+        """
+        pass
+
+
+class FunnelSuggestion(BaseSuggestion):
+    """
+    Suggestion generator, based on the funnel tab.
+    """
+
+    def suggestion_source(self, item_id):
+        """
+        Implement parent method.
+        """
+        return {
+            'value': 'funnel',
+            'child': {
+                'value': item_id,
+            }
+        }
+
+    def filter_funnel(self, funnel):
+        """
+        Filter funnel with level equal 2 and with non zero student on the section.
+        """
+        result = []
+        for item in funnel:
+            if item['level'] == 1 and item['student_count_in'] > 0:
+                result.append(item)
+            if item.get('children'):
+                result += self.filter_funnel(item['children'])
+        return result
+
+    def generate_suggestion(self, snapshot):
+        """
+        Generate suggestion, based on the funnels tab information.
+        """
+        units = list(self.filter_funnel(snapshot['funnel']))
+
+        def get_percent(total, put):
+            return .0 if not (total and put) else float(put) / float(total)
+
+        subsections_percent = np.array([get_percent(unit['student_count_in'], unit['student_count']) for unit in units])
+        # Get an array of elements, which are satisfied to the condition in the brackets. (numpy's feature)
+        subsections_percent = subsections_percent[subsections_percent < 1.0]
+
+        threshold = subsections_percent.mean() + subsections_percent.std()
+
+        description = 'Take a look at `{}`: the number of students that stuck there is {}% higher than average'
+        for unit in units:
+            percent = get_percent(unit['student_count_in'], unit['student_count'])
+            if unit['student_count_in'] > 0 and threshold <= percent < 1.0:
+                self.add_suggestion_item(description.format(unit['name'], int(percent * 100.0)), unit['id'])
+
+
+class ProblemSuggestion(BaseSuggestion):
+    """
+    Suggestion generator, based on the problem tab.
+    """
+
+    def suggestion_source(self, item_id):
+        """
+        Implement parent method.
+        """
+        return {
+            'value': 'problems',
+            'child': {
+                'value': item_id,
+            }
+
+        }
+
+    def generate_suggestion(self, snapshot):
+        """
+        Generate suggestion, based on the funnels tab information.
+        """
+        problem_stat = dict(snapshot['homework'])
+        problem_stat['success'] = map(
+            lambda (grade, attempts): attempts and grade / attempts,
+            izip(problem_stat['correct_answer'], problem_stat['attempts'])
+        )
+
+        problems = np.array(problem_stat['success'])
+        problems = problems[np.nonzero(problems)]
+        threshold = problems.mean() - problems.std()
+
+        description = (
+            'Take a look at `{}`: there is too high avg attempts number and too low value of the mean success rate'
+        )
+        for i in range(len(problem_stat['success'])):
+            if problem_stat['success'][i] and problem_stat['success'][i] < threshold:
+                self.add_suggestion_item(
+                    description.format(problem_stat['names'][i]),
+                    problem_stat['subsection_id'][i],
+                )
+
+
+SUGGESTION_PROVIDERS = [
+    FunnelSuggestion,
+    ProblemSuggestion,
+]
+
+
+def build_course_suggestions(course_key):
+    """
+    Return suggestions of all providers for the course, generated from the shared snapshot of the course.
+    """
+    snapshot = get_course_snapshot(course_key)
+    return sum([provider().get_suggestion_list(snapshot) for provider in SUGGESTION_PROVIDERS], [])
+
+
+def get_course_suggestions(course_key):
+    """
+    Return suggestions of the course, precomputed by the `suggestion_collector` task.
+
+    Suggestions are generated on the cache miss, i.e. when the statistic of the course has been just updated.
+    """
+    key = get_snapshot_key(course_key, 'suggestion')
+    suggestions = cache.get(key)
+    if suggestions is None:
+        suggestions = build_course_suggestions(course_key)
+        cache.set(key, suggestions, SNAPSHOT_TIMEOUT)
+    return suggestions
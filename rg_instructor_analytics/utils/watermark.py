@@ -0,0 +1,70 @@
+"""
+Module with storages of the per-course watermarks of the grade statistic.
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+
+from rg_instructor_analytics.models import GradeStatWatermark
+
+
+class DatabaseWatermarkStorage(object):
+    """
+    Store watermarks in the `GradeStatWatermark` table.
+    """
+
+    def get_many(self, course_keys):
+        """
+        Return map, where key - course key and value - time of the last update of this course.
+
+        Courses without watermark are absent in the result.
+        """
+        return dict(
+            GradeStatWatermark.objects.filter(course_id__in=course_keys).values_list('course_id', 'last_update')
+        )
+
+    def set(self, course_key, last_update):
+        """
+        Store time of the last update of the course.
+        """
+        GradeStatWatermark.objects.update_or_create(course_id=course_key, defaults={'last_update': last_update})
+
+
+class CacheWatermarkStorage(object):
+    """
+    Store watermarks in the django cache, i.e. Redis or local memory cache.
+
+    Cache alias is set by `RG_ANALYTICS_WATERMARK_CACHE`. The cache must not evict keys,
+    because missed watermark leads to the full recalculation of the course.
+    """
+
+    KEY = 'rg_analytics:grade_watermark:{}'
+
+    def __init__(self):
+        """
+        Construct storage.
+        """
+        self.cache = caches[getattr(settings, 'RG_ANALYTICS_WATERMARK_CACHE', 'default')]
+
+    def get_many(self, course_keys):
+        """
+        Implement storage method.
+        """
+        keys = {self.KEY.format(course_key): course_key for course_key in course_keys}
+        return {keys[key]: value for key, value in self.cache.get_many(keys.keys()).iteritems()}
+
+    def set(self, course_key, last_update):
+        """
+        Implement storage method.
+        """
+        self.cache.set(self.KEY.format(course_key), last_update, None)
+
+
+def get_watermark_storage():
+    """
+    Return watermark storage, configured by `RG_ANALYTICS_WATERMARK_STORAGE`.
+    """
+    return import_string(getattr(
+        settings, 'RG_ANALYTICS_WATERMARK_STORAGE',
+        'rg_instructor_analytics.utils.watermark.DatabaseWatermarkStorage'
+    ))()
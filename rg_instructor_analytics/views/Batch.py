@@ -0,0 +1,129 @@
+"""
+Module for the batch api of the analytics widgets.
+"""
+from copy import copy
+import json
+import logging
+from multiprocessing.dummy import Pool
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponseBadRequest, QueryDict
+from django.http.response import JsonResponse
+from django.views.generic import View
+
+from rg_instructor_analytics.utils.AccessMixin import AccessMixin
+from rg_instructor_analytics.utils.response_cache import cached_response
+from rg_instructor_analytics.views.Cohort import CohortStudentsView, CohortView
+from rg_instructor_analytics.views.Enrollment import EnrollmentStatisticView
+from rg_instructor_analytics.views.Funnel import GradeFunnelView
+from rg_instructor_analytics.views.Gradebook import GradebookView
+from rg_instructor_analytics.views.Problem import (
+    ProblemDetailView, ProblemHomeWorkStatisticView, ProblemQuestionView, ProblemsStatisticView
+)
+from rg_instructor_analytics.views.Suggestion import SuggestionView
+from rg_instructor_analytics.views.TabFragment import CourseInfoView
+
+log = logging.getLogger(__name__)
+
+BATCH_CONCURRENCY = getattr(settings, 'RG_ANALYTICS_BATCH_CONCURRENCY', 4)
+BATCH_MAX_REQUESTS = 20
+
+# Read-only apis, available in the batch, by the path after `api/`.
+BATCH_WIDGETS = {
+    'enroll_statics': EnrollmentStatisticView,
+    'problem_statics/homework': ProblemHomeWorkStatisticView,
+    'problem_statics/homeworksproblems': ProblemsStatisticView,
+    'problem_statics/problem_detail': ProblemDetailView,
+    'problem_statics/problem_question_stat': ProblemQuestionView,
+    'gradebook': GradebookView,
+    'cohort': CohortView,
+    'cohort/students': CohortStudentsView,
+    'funnel': GradeFunnelView,
+    'suggestion': SuggestionView,
+    'course_info': CourseInfoView,
+}
+
+
+def build_widget_request(request, course_id, params):
+    """
+    Return copy of the request with the given POST parameters of the widget.
+
+    List values are passed as the multiple values of the parameter.
+    """
+    widget_request = copy(request)
+    widget_request.POST = QueryDict('', mutable=True)
+    for name, value in params.items():
+        values = value if isinstance(value, list) else [value]
+        widget_request.POST.setlist(name, [unicode(item) for item in values])
+    widget_request.POST['course_id'] = course_id
+    return widget_request
+
+
+class BatchView(AccessMixin, View):
+    """
+    Api for the several widgets of the course in one request.
+
+    `requests` is the json list of `{"widget": <api path>, "params": {...}}`. Access to the course is checked
+    and the course is loaded once, widgets are processed concurrently by `BATCH_CONCURRENCY` threads
+    (batch widgets need only the course key, so the course descriptor is not passed to the threads), and
+    `results` of the response contain `{"status": <status code>, "data": <json response>}` of each widget
+    in the order of the requests. Responses of the widgets are cached in the same way as the separate requests.
+    """
+
+    def process_widget(self, request, view_class, params, **kwargs):
+        """
+        Return result of the widget request.
+        """
+        view = view_class()
+        widget_request = build_widget_request(request, kwargs['course_id'], params)
+        try:
+            response = cached_response(
+                view, widget_request, kwargs['course_key'], lambda: view.process(widget_request, **kwargs)
+            )
+        except Exception:
+            log.exception('Unable to process the batch widget %s', view_class.__name__)
+            return {'status': 500, 'data': None}
+        is_json = response.get('Content-Type', '').startswith('application/json')
+        return {'status': response.status_code, 'data': json.loads(response.content) if is_json else None}
+
+    def process_widget_in_thread(self, request, view_class, params, **kwargs):
+        """
+        Return result of the widget request, processed in the separate thread.
+
+        Course descriptor is not thread-safe, so it is not passed to the thread.
+        Database connections are opened per thread, so they are closed when the widget is processed.
+        """
+        kwargs = {name: value for name, value in kwargs.items() if name != 'course'}
+        try:
+            return self.process_widget(request, view_class, params, **kwargs)
+        finally:
+            for connection in connections.all():
+                connection.close()
+
+    def process(self, request, **kwargs):
+        """
+        Process post request.
+        """
+        try:
+            widgets = json.loads(request.POST['requests'])
+            if not isinstance(widgets, list) or len(widgets) > BATCH_MAX_REQUESTS:
+                raise ValueError('Malformed batch')
+            calls = [(BATCH_WIDGETS[widget['widget']], widget.get('params', {})) for widget in widgets]
+            if not all(isinstance(params, dict) for _, params in calls):
+                raise ValueError('Malformed widget params')
+        except (KeyError, TypeError, ValueError, AttributeError):
+            return HttpResponseBadRequest()
+
+        if BATCH_CONCURRENCY > 1 and len(calls) > 1:
+            pool = Pool(min(BATCH_CONCURRENCY, len(calls)))
+            try:
+                results = pool.map(
+                    lambda call: self.process_widget_in_thread(request, call[0], call[1], **kwargs), calls
+                )
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            results = [self.process_widget(request, view_class, params, **kwargs) for view_class, params in calls]
+        return JsonResponse(data={'results': results})
@@ -1,9 +1,8 @@
 """
 Module for cohort subtab.
 """
-import math
-
-from django.contrib.auth.models import User
+from django.conf import settings
+from django.http import HttpResponseBadRequest
 from django.http.response import JsonResponse
 from django.utils.translation import ugettext as _
 from django.views.generic import View
@@ -11,148 +10,129 @@ from django.views.generic import View
 from rg_instructor_analytics import tasks
 from rg_instructor_analytics.models import GradeStatistic
 from rg_instructor_analytics.utils.AccessMixin import AccessMixin
+from rg_instructor_analytics.utils.cohort import (
+    cohort_filter, get_cohort_counts, get_grade_summary, get_thresholds, parse_thresholds
+)
+
+COHORT_STUDENTS_PAGE_SIZE = getattr(settings, 'RG_ANALYTICS_COHORT_STUDENTS_PAGE_SIZE', 100)
 
 
 class CohortView(AccessMixin, View):
     """
     Api for cohort statistic.
+
+    Thresholds and sizes of the cohorts are computed by the database, so the response does not depend
+    on the count of the students. Students of the cohort are provided by the `CohortStudentsView`.
     """
 
+    cache_timeout = 60 * 60
+
     @staticmethod
-    def generate_cohort_by_mean_and_dispersion(student_info):
+    def get_labels(cohorts):
         """
-        Generate cohort.
-
-        :param student_info [
-                    {
-                        'id': 'user id',
-                        'username': 'user name',
-                        'grade': 'user grade'
-                    }
-                    .....
-                ]
-
-        Generate cohort for next algorithm:
-        1. Calculate mean(m) and standart deviation(s) of total grade [0,1]
-        2. Set thresholds 0:(m - 3s):(m - 0.5s):(m + 0.5s):(m - 3s):1
-        3. Return [
-            {
-                'max_progress': 'max progress in this cohort',
-                'students_id': 'list of hte students ids',
-                'students_username': 'list of hte students usernames',
-                'percent': 'percent of this cohort in course enrollments'
-            } for t in thresholds
-        ]
+        Return labels of the cohorts.
         """
-        marks = [i['grade'] for i in student_info]
-        mark_count = len(marks)
-        mean = sum(marks) / mark_count
-        s = math.sqrt(sum([(x - mean) ** 2 for x in marks]) / mark_count)
-        thresholds = [0]
-
-        def add_thresholds(value):
-            """
-            Prevent invalid values of the threshold.
-
-            Invalid values - negative, positive and more than 1 or values with diff less than 1 percent.
-            """
-            if value < 0.0 or value > 1.0 or abs(thresholds[-1] - value) < (1.0 / 100.0):
-                return
-            thresholds.append(value)
-
-        add_thresholds(0.0)
-        add_thresholds(mean - 3 * s)
-        add_thresholds(mean - 0.5 * s)
-        add_thresholds(mean + 0.5 * s)
-        add_thresholds(mean + 3 * s)
-        add_thresholds(1.0)
-        return CohortView.split_students(student_info, thresholds)
+        labels = []
+        for i in range(len(cohorts)):
+            if cohorts[i]['max_progress'] == 0:
+                labels.append(_('zero progress'))
+            else:
+                labels.append(
+                    _('from ') + str(cohorts[i - 1]['max_progress']) + ' %' +
+                    _(' to ') + str(cohorts[i]['max_progress']) + ' %'
+                )
+        return labels
 
-    @staticmethod
-    def split_students(student_info, thresholds):
+    def process(self, request, **kwargs):
         """
-        Split student by thresholds.
-
-        Return Return [
-            {
-                'max_progress': 'max progress in this cohort',
-                'students_id': 'list of hte students ids',
-                'students_username': 'list of hte students usernames',
-                'percent': 'percent of this cohort in course enrollments'
-            } for t in thresholds
-        ]
+        Process post request.
         """
-        gistogram = {t: {'students_id': [], 'students_names': [], 'count': 0} for t in thresholds}
-        for s in student_info:
-            for t in thresholds:
-                if (s['grade'] < t) or (s['grade'] == t and (t in [0, 1])):
-                    gistogram[t]['students_id'].append(s['id'])
-                    gistogram[t]['students_names'].append(s['username'])
-                    gistogram[t]['count'] += 1
-                    break
-
-        student_count = float(len(student_info))
-
-        return [
+        students = GradeStatistic.objects.filter(course_id=kwargs['course_key'])
+        students_count, mean, std = get_grade_summary(students)
+        # Return empty lost of the cohorts, when precollect statistic is empty.
+        if not students_count:
+            return JsonResponse(data={'labels': [], 'values': [], 'cohorts': [], 'thresholds': []})
+
+        thresholds = get_thresholds(mean, std)
+        counts = get_cohort_counts(students, thresholds)
+        cohorts = [
             {
-                'max_progress': int(t * 100.0),
-                'students_id': gistogram[t]['students_id'],
-                'students_username': gistogram[t]['students_names'],
-                'percent': int(float(gistogram[t]['count']) / student_count * 100.0)
-            } for t in thresholds
+                'max_progress': int(threshold * 100.0),
+                'count': count,
+                'percent': int(float(count) / students_count * 100.0),
+            }
+            for threshold, count in zip(thresholds, counts)
         ]
+        return JsonResponse(data={
+            'labels': self.get_labels(cohorts),
+            'values': [cohort['percent'] for cohort in cohorts],
+            'cohorts': cohorts,
+            'thresholds': thresholds,
+        })
+
+
+class CohortStudentsView(AccessMixin, View):
+    """
+    Api for the students of the cohort.
+
+    Cohort is set by the `thresholds` of the cohort statistic and the `cohort` index, students are ordered
+    by id and returned by pages of `limit` students, next page starts after the `cursor` student.
+    """
+
+    cache_timeout = 60 * 60
 
     def process(self, request, **kwargs):
         """
         Process post request.
         """
-        grade_stat = (
+        try:
+            thresholds = parse_thresholds(request.POST['thresholds'])
+            cohort = cohort_filter(thresholds, int(request.POST['cohort']))
+            limit = min(max(int(request.POST.get('limit', COHORT_STUDENTS_PAGE_SIZE)), 1), 1000)
+            cursor = int(request.POST.get('cursor') or 0)
+        except (KeyError, ValueError):
+            return HttpResponseBadRequest()
+
+        students = list(
             GradeStatistic.objects
-            .filter(course_id=kwargs['course_key'])
-            .values('student_id', 'student__username', 'total')
-        )
-        # Return empty lost of the cohorts, when precollect statistic is empty.
-        if len(grade_stat) == 0:
-            return JsonResponse(data={'labels': [], 'values': [], 'cohorts': []})
-        cohorts = self.generate_cohort_by_mean_and_dispersion(
-            [
-                {
-                    'id': grade['student_id'],
-                    'username': grade['student__username'],
-                    'grade': grade['total']}
-                for grade in grade_stat
-            ]
+            .filter(cohort, course_id=kwargs['course_key'], student_id__gt=cursor)
+            .order_by('student_id')
+            .values_list('student_id', 'student__username')[:limit + 1]
         )
-
-        labels = []
-        for i in range(len(cohorts)):
-            if cohorts[i]['max_progress'] == 0:
-                labels.append(_('zero progress'))
-            else:
-                labels.append(
-                    _('from ') + str(cohorts[i - 1]['max_progress']) + ' %' +
-                    _(' to ') + str(cohorts[i]['max_progress']) + ' %'
-                )
-        values = [i['percent'] for i in cohorts]
-        return JsonResponse(data={'labels': labels, 'values': values, 'cohorts': cohorts})
+        next_cursor = students[limit - 1][0] if len(students) > limit else None
+        return JsonResponse(data={
+            'students': [{'id': student_id, 'username': username} for student_id, username in students[:limit]],
+            'next_cursor': next_cursor,
+        })
 
 
 class CohortSendMessage(AccessMixin, View):
     """
     Endpoint for sending email message.
+
+    Recipients are the students of the cohorts with the given indexes (comma separated `cohorts`),
+    defined by the `thresholds` of the cohort statistic. Recipients are resolved and the message is delivered
+    by the celery task, so the request does not depend on the size of the cohorts.
     """
 
     def process(self, request, **kwargs):
         """
         Process post request.
         """
-        users_ids_list = [int(id) for id in request.POST['users_ids'].split(',') if id != '']
-        users_emails = [
-            str(email) for email in User.objects.filter(id__in=users_ids_list).values_list('email', flat=True)
-        ]
+        try:
+            thresholds = parse_thresholds(request.POST['thresholds'])
+            cohorts = [int(index) for index in request.POST['cohorts'].split(',')]
+            for index in cohorts:
+                cohort_filter(thresholds, index)
+            subject, message = request.POST['subject'], request.POST['body']
+        except (KeyError, ValueError):
+            return HttpResponseBadRequest()
+
         tasks.send_email_to_cohort.delay(
-            subject=request.POST['subject'],
-            message=request.POST['body'],
-            students=users_emails
+            course_string_id=unicode(kwargs['course_key']),
+            thresholds=thresholds,
+            cohorts=cohorts,
+            subject=subject,
+            message=message,
         )
         return JsonResponse({'status': 'ok'})
@@ -1,48 +1,197 @@
 """
 Module for gradebook subtab.
 """
-from collections import OrderedDict
+import base64
 import json
 
+from django.conf import settings
 from django.db.models import Q
+from django.http import HttpResponseBadRequest
 from django.http.response import JsonResponse
 from django.views.generic import View
 
-from rg_instructor_analytics.models import GradeStatistic
+from rg_instructor_analytics.models import GradeStatistic, GradeStatisticItem
 from rg_instructor_analytics.utils.AccessMixin import AccessMixin
+from rg_instructor_analytics.utils.search import search_students
+
+GRADEBOOK_PAGE_SIZE = getattr(settings, 'RG_ANALYTICS_GRADEBOOK_PAGE_SIZE', 50)
+GRADEBOOK_MAX_PAGE_SIZE = 1000
+# Sort keys, that are sorted by the database, other sort keys are the exam labels.
+SQL_SORT_FIELDS = {
+    'username': 'student__username',
+    'total': 'total',
+}
+
+
+def encode_cursor(value, student_id):
+    """
+    Return opaque cursor, that points to the row with the given sort value and student.
+    """
+    return base64.urlsafe_b64encode(json.dumps([value, student_id]))
+
+
+def keyset_filter(queryset, sort_field, id_field, descending, cursor):
+    """
+    Return rows of the queryset, that follow the cursor in the order of `(sort_field, id_field)`.
+    """
+    if cursor is None:
+        return queryset
+    value, student_id = cursor
+    lookup = 'lt' if descending else 'gt'
+    return queryset.filter(
+        Q(**{'{}__{}'.format(sort_field, lookup): value}) |
+        Q(**{sort_field: value, '{}__{}'.format(id_field, lookup): student_id})
+    )
+
+
+def keyset_ordering(sort_field, id_field, descending):
+    """
+    Return ordering of the rows, that is used by the keyset filter.
+    """
+    return ['-' + field if descending else field for field in (sort_field, id_field)]
+
+
+def decode_cursor(cursor):
+    """
+    Return sort value and student of the cursor.
+
+    :raise ValueError: if the cursor is malformed.
+    """
+    try:
+        value, student_id = json.loads(base64.urlsafe_b64decode(str(cursor)))
+        return value, int(student_id)
+    except TypeError:
+        raise ValueError('Malformed cursor')
 
 
 class GradebookView(AccessMixin, View):
     """
     Api for gradebook.
+
+    Students are returned by pages of `limit` rows, ordered by `sort` (`username`, `total` or the exam label)
+    in the `order` (`asc` or `desc`) direction. The next page is requested with the `next_cursor` of the
+    previous response, `fields` limits the returned exam columns.
     """
 
+    cache_timeout = 60 * 60
+
+    @staticmethod
+    def get_students(course_key, filter_string):
+        """
+        Return grade statistic of the course students, filtered by the given string.
+
+        Filter is matched against the username, names and email of the student, see `utils.search`.
+        """
+        students = GradeStatistic.objects.filter(course_id=course_key)
+        if filter_string:
+            students = search_students(students, course_key, filter_string)
+        return students
+
+    @staticmethod
+    def get_exam_names(course_key):
+        """
+        Return ordered labels of the course exams.
+
+        Exams are the same for all students of the course, so labels are taken from one student.
+        """
+        items = GradeStatisticItem.objects.filter(course_id=course_key)
+        student = items.values_list('student', flat=True).first()
+        if student is None:
+            return []
+        return list(items.filter(student=student).order_by('position').values_list('label', flat=True))
+
+    @staticmethod
+    def get_sql_page(students, sort_field, descending, cursor, limit):
+        """
+        Return `limit + 1` students after the cursor, sorted by the field of the grade statistic.
+        """
+        students = keyset_filter(students, sort_field, 'student_id', descending, cursor)
+        rows = (
+            students
+            .order_by(*keyset_ordering(sort_field, 'student_id', descending))
+            .values('student_id', 'student__username', sort_field)
+        )
+        return [
+            {'student_id': row['student_id'], 'username': row['student__username'], 'sort_value': row[sort_field]}
+            for row in rows[:limit + 1]
+        ]
+
+    @staticmethod
+    def get_exam_page(course_key, students, exam_name, descending, cursor, limit):
+        """
+        Return `limit + 1` students after the cursor, sorted by the grade of the exam.
+        """
+        items = GradeStatisticItem.objects.filter(
+            course_id=course_key, label=exam_name, student__in=students.values('student_id')
+        )
+        items = keyset_filter(items, 'percent', 'student', descending, cursor)
+        items = list(
+            items.order_by(*keyset_ordering('percent', 'student', descending)).values_list('student', 'percent')
+            [:limit + 1]
+        )
+        usernames = dict(
+            GradeStatistic.objects
+            .filter(course_id=course_key, student_id__in=[student for student, _ in items])
+            .values_list('student_id', 'student__username')
+        )
+        return [
+            {'student_id': student, 'username': usernames.get(student), 'sort_value': percent}
+            for student, percent in items
+        ]
+
+    @staticmethod
+    def get_grades(course_key, students, exam_names):
+        """
+        Return map, where key - student id and value - map of the exam label to the grade of the student.
+        """
+        grades = {}
+        items = (
+            GradeStatisticItem.objects
+            .filter(course_id=course_key, student__in=students, label__in=exam_names)
+            .values_list('student', 'label', 'percent')
+        )
+        for student, label, percent in items:
+            grades.setdefault(student, {})[label] = percent
+        return grades
+
     def process(self, request, **kwargs):
         """
         Process post request.
         """
-        filter_string = request.POST['filter']
-
         course_key = kwargs['course_key']
-        enrolled_students = GradeStatistic.objects.filter(course_id=course_key)
-        if filter_string:
-            enrolled_students = enrolled_students.filter(
-                Q(student__username__icontains=filter_string) |
-                Q(student__first_name__icontains=filter_string) |
-                Q(student__last_name__icontains=filter_string) |
-                Q(student__email__icontains=filter_string)
-            )
-        enrolled_students = enrolled_students.order_by('student__username').values('student__username', 'exam_info')
-        student_info = [
-            json.JSONDecoder(object_pairs_hook=OrderedDict).decode(student['exam_info'])
-            for student in enrolled_students
-        ]
-        students_names = [student['student__username'] for student in enrolled_students]
-        exam_names = list(student_info[0].keys()) if len(student_info) > 0 else []
+        sort = request.POST.get('sort', 'username')
+        descending = request.POST.get('order') == 'desc'
+        try:
+            limit = min(max(int(request.POST.get('limit', GRADEBOOK_PAGE_SIZE)), 1), GRADEBOOK_MAX_PAGE_SIZE)
+            cursor = decode_cursor(request.POST['cursor']) if request.POST.get('cursor') else None
+        except ValueError:
+            return HttpResponseBadRequest()
+
+        exam_names = self.get_exam_names(course_key)
+        students = self.get_students(course_key, request.POST.get('filter', ''))
+        if sort in SQL_SORT_FIELDS:
+            page = self.get_sql_page(students, SQL_SORT_FIELDS[sort], descending, cursor, limit)
+        elif sort in exam_names:
+            page = self.get_exam_page(course_key, students, sort, descending, cursor, limit)
+        else:
+            return HttpResponseBadRequest()
+
+        next_cursor = None
+        if len(page) > limit:
+            page = page[:limit]
+            next_cursor = encode_cursor(page[-1]['sort_value'], page[-1]['student_id'])
+
+        fields = request.POST.getlist('fields')
+        if fields:
+            exam_names = [name for name in exam_names if name in fields]
+        grades = self.get_grades(course_key, [row['student_id'] for row in page], exam_names)
         return JsonResponse(
             data={
-                'student_info': student_info,
+                'student_info': [
+                    {name: grades.get(row['student_id'], {}).get(name) for name in exam_names} for row in page
+                ],
                 'exam_names': exam_names,
-                'students_names': students_names,
+                'students_names': [row['username'] for row in page],
+                'next_cursor': next_cursor,
             }
         )
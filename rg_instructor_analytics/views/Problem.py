@@ -2,19 +2,17 @@
 Module for problem subtab.
 """
 from abc import ABCMeta, abstractmethod
-from itertools import chain
 import json
 
-from django.db.models import Avg, Sum
-from django.db.models import IntegerField
-from django.db.models.expressions import RawSQL
 from django.http.response import JsonResponse
 from django.views.generic import View
 
-from courseware.courses import get_course_by_id
 from courseware.models import StudentModule
 from courseware.module_render import xblock_view
+from rg_instructor_analytics.models import ProblemStatistic
 from rg_instructor_analytics.utils.AccessMixin import AccessMixin
+from rg_instructor_analytics.utils.homework import get_homework_stat
+from rg_instructor_analytics.utils.state import get_state_fields
 
 
 QUESTUIN_SELECT_TYPE = 'select'
@@ -26,85 +24,16 @@ class ProblemHomeWorkStatisticView(AccessMixin, View):
     Api for get homework`s statistic for given course.
     """
 
+    cache_timeout = 60 * 60
     _PARSABLE_PROBLEMS = frozenset(['multiplechoiceresponse', 'choiceresponse', 'stringresponse', 'optionresponse'])
     _LABEL = 'label'
     _DESCRIPTION = 'label'
 
-    ATTEMPTS_REQUEST = RawSQL(
-        "SELECT SUBSTRING_INDEX(SUBSTRING_INDEX(state,'attempts\": ',-1),',',1)", (), output_field=IntegerField()
-    )
-
-    def academic_performance_request(self, course_key):
-        """
-        Make request to db for academic performance.
-
-        Return list, where each item contain id of the problem, average count of attempts and percent of correct answer.
-        """
-        return (
-            StudentModule.objects
-            .filter(course_id__exact=course_key, grade__isnull=False, module_type__exact="problem")
-            .values('module_state_key')
-            .annotate(attempts_avg=Avg(self.ATTEMPTS_REQUEST))
-            .annotate(grade_avg=Sum('grade') / Sum('max_grade'))
-            .values('module_state_key', 'attempts_avg', 'grade_avg')
-        )
-
-    def get_academic_performance(self, course_key):
-        """
-        Provide map, where key - course and value - map with average grade and attempt.
-        """
-        return {
-            i['module_state_key']: {'grade_avg': i['grade_avg'], 'attempts_avg': i['attempts_avg']}
-            for i in self.academic_performance_request(course_key)
-        }
-
-    def get_homework_stat(self, course_key):
-        """
-        Provide statistic for given course.
-
-        :param course_key:  object, that represent course.
-        :return: map with list of correct answers, attempts, list of the problems for unit and names.
-        Each item of given list represent one unit.
-        """
-        academic_performance = self.get_academic_performance(course_key)
-        course = get_course_by_id(course_key, depth=4)
-        stat = {'correct_answer': [], 'attempts': [], 'problems': [], 'names': [], 'subsection_id': []}
-        hw_number = 0
-
-        for subsection in chain.from_iterable(section.get_children() for section in course.get_children()):
-            if not subsection.graded:
-                continue
-            hw_number += 1
-            stat['correct_answer'].append(0)
-            stat['attempts'].append(0)
-            stat['problems'].append([])
-            stat['names'].append(subsection.display_name)
-            stat['subsection_id'].append(subsection.location.to_deprecated_string())
-
-            problems_in_hw = 0
-
-            for child in chain.from_iterable(unit.get_children() for unit in subsection.get_children()):
-                if child.location.category == 'problem':
-                    problem_id = child.location.to_deprecated_string()
-                    if problem_id in academic_performance:
-                        current_performance = academic_performance[problem_id]
-                        stat['correct_answer'][-1] += current_performance['grade_avg']
-                        stat['attempts'][-1] += current_performance['attempts_avg']
-                        problems_in_hw += 1
-
-                    stat['problems'][-1].append(problem_id)
-
-            if problems_in_hw > 0:
-                stat['correct_answer'][-1] /= problems_in_hw
-                stat['attempts'][-1] /= problems_in_hw
-
-        return stat
-
     def process(self, request, **kwargs):
         """
         Process post request.
         """
-        return JsonResponse(data=self.get_homework_stat(kwargs['course_key']))
+        return JsonResponse(data=get_homework_stat(kwargs['course_key']))
 
 
 class ProblemsStatisticView(AccessMixin, View):
@@ -112,6 +41,8 @@ class ProblemsStatisticView(AccessMixin, View):
     Api for getting statistic for each problem in unit.
     """
 
+    cache_timeout = 60 * 60
+
     def process(self, request, **kwargs):
         """
         Process post request.
@@ -120,14 +51,19 @@ class ProblemsStatisticView(AccessMixin, View):
         problems_ids = request.POST.getlist('problems')
         problems = [course_key.make_usage_key_from_deprecated_string(p) for p in problems_ids]
         stats = (
-            StudentModule.objects
-            .filter(module_state_key__in=problems, grade__isnull=False)
-            .values('module_state_key')
-            .annotate(grades=Sum('grade'))
-            .annotate(max_grades=Sum('max_grade'))
-            .annotate(attempts=Avg(ProblemHomeWorkStatisticView.ATTEMPTS_REQUEST))
-            .values('module_state_key', 'grades', 'max_grades', 'attempts')
+            ProblemStatistic.objects
+            .filter(course_id=course_key, module_state_key__in=problems)
+            .values('module_state_key', 'sum_grade', 'sum_max_grade', 'attempts_sum', 'attempts_count')
         )
+        stats = [
+            {
+                'module_state_key': s['module_state_key'],
+                'grades': s['sum_grade'],
+                'max_grades': s['sum_max_grade'],
+                'attempts': s['attempts_count'] and float(s['attempts_sum']) / s['attempts_count'],
+            }
+            for s in stats
+        ]
 
         problems_stat = [None] * len(problems_ids)
         for s in stats:
@@ -189,15 +125,45 @@ class ProblemQuestionParser():
         """
         pass
 
+    @abstractmethod
+    def process_histogram_item(self, state, answer, count):
+        """
+        Abstract method for process precollected count of the answer and update statistic.
+        """
+        pass
+
+    def get_answers_histogram(self):
+        """
+        Provide precollected histogram of the question answers.
+
+        Return empty histogram, when nobody has answered the question, and None,
+        when histogram is not collected (problem has not been processed yet or question has too many answers).
+        """
+        answers = (
+            ProblemStatistic.objects
+            .filter(course_id=self.problemID.course_key, module_state_key=self.problemID)
+            .values_list('answers', flat=True)
+            .first()
+        )
+        if answers is None:
+            return None
+        return json.loads(answers).get(self.questionID, {})
+
     def get_statistic(self):
         """
         Provide statistic for given question.
         """
+        result = self.init_statistic_object()
+        histogram = self.get_answers_histogram()
+        if histogram is not None:
+            for answer, count in histogram.iteritems():
+                self.process_histogram_item(result, answer, count)
+            return result
+
         problems = StudentModule.objects.filter(module_state_key=self.problemID, grade__isnull=False,
                                                 module_type__exact="problem").values_list('state', flat=True)
-        result = self.init_statistic_object()
         for p in problems:
-            self.process_statistic_item(result, json.loads(p))
+            self.process_statistic_item(result, get_state_fields(p, ('student_answers',)))
         return result
 
 
@@ -224,6 +190,15 @@ class ProblemSelectQuestion(ProblemQuestionParser):
         """
         state['stats'][self.answer_map[item['student_answers'][self.questionID]]] += 1
 
+    def process_histogram_item(self, state, answer, count):
+        """
+        Overwrite base class.
+
+        Multiple choice answers are counted by choices in the histogram, so it is suitable for the subclass as well.
+        """
+        if answer in self.answer_map:
+            state['stats'][self.answer_map[answer]] += count
+
 
 class ProblemMultiSelectQuestion(ProblemSelectQuestion):
     """
@@ -249,6 +224,8 @@ class ProblemQuestionView(AccessMixin, View):
     Api for question statistic.
     """
 
+    cache_timeout = 60 * 60
+
     def process(self, request, **kwargs):
         """
         Process post request.
@@ -3,18 +3,18 @@ Module for tab fragment.
 """
 import json
 import sys
-from time import mktime
 
 from django.conf import settings
-from django.http import Http404
+from django.http import HttpResponseBadRequest
+from django.http.response import JsonResponse
+from django.views.generic import View
 from web_fragments.fragment import Fragment
 from web_fragments.views import FragmentView
 
-from courseware.courses import get_course_by_id
 from edxmako.shortcuts import render_to_string
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 from rg_instructor_analytics.utils.AccessMixin import AccessMixin
-from student.models import CourseAccessRole
+from rg_instructor_analytics.utils.courses import get_available_courses, get_enroll_info
 
 # NOTE(flying-pi) reload(sys) is used for restore method `setdefaultencoding`,
 # which set flag PYTHONIOENCODING to utf8.
@@ -24,80 +24,41 @@ sys.setdefaultencoding('utf8')
 JS_URL = '{static_url}rg_instructor_analytics/js/'.format(static_url=settings.STATIC_URL)
 CSS_URL = '{static_url}rg_instructor_analytics/css/'.format(static_url=settings.STATIC_URL)
 
+COURSE_LIST_PAGE_SIZE = getattr(settings, 'RG_ANALYTICS_COURSE_LIST_PAGE_SIZE', 100)
+
 
 class InstructorAnalyticsFragmentView(AccessMixin, FragmentView):
     """
     Fragment for render tab.
     """
 
-    def get_enroll_info(self, course):
-        """
-        Return enroll_start and enroll_end for given course.
-        """
-        enroll_start = course.enrollment_start
-        if enroll_start is None:
-            enroll_start = course.start
-
-        enroll_end = course.enrollment_end
-        if enroll_end is None:
-            enroll_end = course.end
-
-        return {
-            'enroll_start': mktime(enroll_start.timetuple()) if enroll_start else 'null',
-            'enroll_end': mktime(enroll_end.timetuple()) if enroll_end else 'null',
-        }
-
-    def get_avalibel_courses(self, user):
-        """
-        Return courses, available for the given user.
-        """
-        result = []
-        # For staff user we need return all available courses on platform.
-        if user.is_staff:
-            available_courses = CourseOverview.objects.all()
-            for course in available_courses:
-                try:
-                    result.append(get_course_by_id(course.id, depth=0))
-                except Http404:
-                    continue
-        # Return courses, where user has permission as instructor of staff
-        else:
-            available_courses = CourseAccessRole.objects.filter(user=user, role__in=['instructor', 'staff'])
-            exist_courses_id = []
-            for record in available_courses:
-                try:
-                    course = get_course_by_id(record.course_id, depth=0)
-                    course_id = str(course.id)
-                    if course_id not in exist_courses_id:
-                        result.append(course)
-                        exist_courses_id.append(course_id)
-                except Http404:
-                    continue
-        return result
-
     def process(self, request, **kwargs):
         """
         Render tab fragment.
+
+        Course dropdown contains the first page of the available courses and the current course,
+        next pages are loaded by the `CourseListView`.
         """
         course = kwargs['course']
+        current_course_id = unicode(course.id)
+        courses = get_available_courses(request.user)
         available_courses = [
-            {
-                'course_id': str(c.id),
-                'course_name': str(c.display_name),
-                'is_current': course == c,
-            }
-            for c in self.get_avalibel_courses(request.user)
+            dict(course_info, is_current=course_info['course_id'] == current_course_id)
+            for course_info in courses[:COURSE_LIST_PAGE_SIZE]
         ]
-
-        enroll_info = {
-            str(c.id): self.get_enroll_info(c)
-            for c in self.get_avalibel_courses(request.user)
-        }
+        if not any(course_info['is_current'] for course_info in available_courses):
+            available_courses.insert(0, {
+                'course_id': current_course_id,
+                'course_name': unicode(course.display_name),
+                'is_current': True,
+            })
 
         context = {
             'course': course,
-            'enroll_info': json.dumps(enroll_info),
-            'available_courses': available_courses
+            # Info of the other courses is loaded by the `CourseInfoView`, when the course is selected.
+            'enroll_info': json.dumps({current_course_id: get_enroll_info(course)}),
+            'available_courses': available_courses,
+            'next_courses_offset': COURSE_LIST_PAGE_SIZE if len(courses) > COURSE_LIST_PAGE_SIZE else None,
         }
 
         html = render_to_string('rg_instructor_analytics/instructor_analytics_fragment.html', context)
@@ -114,3 +75,45 @@ class InstructorAnalyticsFragmentView(AccessMixin, FragmentView):
         fragment.add_css_url(CSS_URL + 'instructor_analytics.css')
 
         return fragment
+
+
+class CourseInfoView(AccessMixin, View):
+    """
+    Api for the metadata of the course, used by the tabs after the course selection.
+
+    Enrollment dates are taken from the course overview, so the view does not need the course descriptor.
+    """
+
+    def process(self, request, **kwargs):
+        """
+        Process post request.
+        """
+        return JsonResponse(data={
+            'course_id': unicode(kwargs['course_key']),
+            'enroll_info': get_enroll_info(CourseOverview.get_from_id(kwargs['course_key'])),
+        })
+
+
+class CourseListView(AccessMixin, View):
+    """
+    Api for the page of the courses, available for the user, used by the course dropdown.
+    """
+
+    # Response depends on the user, so it is cached by the `get_available_courses` only.
+    cache_timeout = None
+
+    def process(self, request, **kwargs):
+        """
+        Process post request.
+        """
+        try:
+            offset = max(int(request.POST.get('offset', 0)), 0)
+            limit = min(max(int(request.POST.get('limit', COURSE_LIST_PAGE_SIZE)), 1), 1000)
+        except ValueError:
+            return HttpResponseBadRequest()
+
+        courses = get_available_courses(request.user)
+        return JsonResponse(data={
+            'courses': courses[offset:offset + limit],
+            'next_offset': offset + limit if len(courses) > offset + limit else None,
+        })